@@ -0,0 +1,145 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+
+HTML fixtures for the offline benchmarks, one per supported site plus a generic page.
+The pages mirror the markup the domain extractors look for, padded with the kind of
+navigation, scripts and boilerplate real pages carry. Regenerate them with:
+
+    python -m benchmarks.fixtures
+"""
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "html")
+
+# name -> (URL the page is parsed as, file name)
+FIXTURES = {
+    "imdb": ("https://www.imdb.com/chart/top/", "imdb_chart_top.html"),
+    "wikipedia": ("https://en.wikipedia.org/wiki/Category:Machine_learning_algorithms", "wikipedia_category.html"),
+    "github": ("https://github.com/topics/machine-learning", "github_topic.html"),
+    "unsplash": ("https://unsplash.com/", "unsplash_home.html"),
+    "generic": ("https://example.com/blog/post", "generic_article.html"),
+}
+
+WORDS = (
+    "model data learning network training feature vector gradient layer loss "
+    "sample cluster tree forest kernel boost regression label accuracy batch "
+    "tensor weight bias epoch metric optimizer dataset pipeline inference"
+).split()
+
+def load(name):
+    """Returns (url, html) for a fixture"""
+    url, file_name = FIXTURES[name]
+    with open(os.path.join(FIXTURE_DIR, file_name), encoding="utf-8") as f:
+        return url, f.read()
+
+def load_all():
+    return {name: load(name) for name in FIXTURES}
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def _page(title, body, rng):
+    scripts = "".join(
+        f"<script>window.__state_{i} = {{\"k\": \"{_words(rng, 20)}\"}};</script>" for i in range(10))
+    nav = "".join(f'<li><a href="/nav/{i}">{_words(rng, 2)}</a></li>' for i in range(40))
+    footer = "".join(f'<a href="/footer/{i}">{_words(rng, 2)}</a> ' for i in range(30))
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\">"
+        f"<title>{title}</title><style>body {{ margin: 0 }} .x {{ color: red }}</style>{scripts}</head>"
+        f"<body><header><nav><ul>{nav}</ul></nav></header>{body}"
+        f"<footer>{footer}<a href=\"https://ads.example.net/ad/1\">ad</a>"
+        "<a href=\"javascript:void(0)\">js</a><a href=\"mailto:team@example.com\">mail</a></footer>"
+        "</body></html>"
+    )
+
+def _imdb(rng):
+    rows = []
+    for rank in range(1, 251):
+        genres = "".join(f'<span class="ipc-chip__text">{rng.choice(["Drama", "Crime", "Action", "Sci-Fi"])}</span>'
+                         for _ in range(2))
+        rows.append(
+            '<li class="ipc-metadata-list-summary-item sc-1"><div class="ipc-metadata-list-summary-item__c">'
+            f'<div class="ipc-poster"><img alt="{_words(rng, 3)}" src="https://m.media-amazon.com/images/{rank}.jpg"></div>'
+            f'<a href="/title/tt{rank:07d}/" class="ipc-title-link-wrapper">'
+            f'<h3 class="ipc-title__text">{rank}. {_words(rng, 3).title()}</h3></a>'
+            '<div class="cli-title-metadata">'
+            f'<span class="cli-title-metadata-item">{rng.randint(1930, 2024)}</span>'
+            f'<span class="cli-title-metadata-item">{rng.randint(1, 3)}h {rng.randint(0, 59)}m</span>'
+            '<span class="cli-title-metadata-item">R</span></div>'
+            f'<span class="ipc-rating-star ipc-rating-star--imdb">{rng.randint(80, 93) / 10}'
+            f'<span class="ipc-rating-star--voteCount">({rng.randint(100, 2900)}K)</span></span>'
+            f'<div class="ipc-chip-list">{genres}</div></div></li>'
+        )
+    body = f'<main><ul class="ipc-metadata-list ipc-metadata-list--dividers-between">{"".join(rows)}</ul></main>'
+    return _page("IMDb Top 250 Movies", body, rng)
+
+def _wikipedia(rng):
+    subcategories = "".join(f'<li><a href="/wiki/Category:{_words(rng, 2).replace(" ", "_")}">{_words(rng, 2)}</a></li>'
+                            for _ in range(40))
+    pages = "".join(f'<li><a href="/wiki/{_words(rng, 2).replace(" ", "_")}_{i}">{_words(rng, 3)}</a></li>'
+                    for i in range(200))
+    body = (
+        '<div id="content"><div id="mw-content-text"><div class="mw-category-generated">'
+        f'<div id="mw-subcategories"><h2>Subcategories</h2><ul>{subcategories}</ul></div>'
+        f'<div id="mw-pages"><h2>Pages in category</h2><ul>{pages}</ul></div>'
+        f'</div><p>{_words(rng, 300)}</p></div></div>'
+    )
+    return _page("Category:Machine learning algorithms - Wikipedia", body, rng)
+
+def _github(rng):
+    topics = "".join(f'<a class="topic-tag topic-tag-link" href="/topics/{word}">{word}</a>'
+                     for word in rng.sample(WORDS, 15))
+    repos = "".join(
+        '<article class="border rounded">'
+        f'<h3><a class="text-bold wb-break-word" href="/{_words(rng, 1)}/{_words(rng, 1)}-{i}">'
+        f'{_words(rng, 1)} / {_words(rng, 1)}-{i}</a></h3>'
+        f'<p>{_words(rng, 40)}</p><span>{rng.randint(100, 90000)} stars</span></article>'
+        for i in range(30)
+    )
+    body = f'<main><div class="topics">{topics}</div>{repos}</main>'
+    return _page("machine-learning · GitHub Topics · GitHub", body, rng)
+
+def _unsplash(rng):
+    images = "".join(
+        f'<figure><a href="/photos/{i:08x}"><img alt="{_words(rng, 6)}" '
+        f'src="https://images.unsplash.com/photo-{i}?w=400" srcset="{" ".join(f"x{w}" for w in range(8))}"></a>'
+        f'<figcaption>{_words(rng, 4)}</figcaption></figure>'
+        for i in range(60)
+    )
+    body = f'<main><div class="masonry">{images}</div></main>'
+    return _page("Beautiful Free Images & Pictures | Unsplash", body, rng)
+
+def _generic(rng):
+    paragraphs = "".join(f'<p>{_words(rng, 80)} <a href="/blog/{i}">{_words(rng, 2)}</a></p>' for i in range(60))
+    sidebar = "".join(f'<li><a href="https://other-{i}.example.org/">{_words(rng, 2)}</a></li>' for i in range(50))
+    body = f'<article><h1>{_words(rng, 6)}</h1>{paragraphs}</article><aside><ul>{sidebar}</ul></aside>'
+    return _page("A generic blog post", body, rng)
+
+GENERATORS = {
+    "imdb": _imdb,
+    "wikipedia": _wikipedia,
+    "github": _github,
+    "unsplash": _unsplash,
+    "generic": _generic,
+}
+
+def generate():
+    """Writes every fixture; a fixed seed keeps the output stable between runs"""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, (_, file_name) in FIXTURES.items():
+        html = GENERATORS[name](random.Random(name))
+        with open(os.path.join(FIXTURE_DIR, file_name), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"Wrote {file_name} ({len(html)} bytes)")
+
+if __name__ == "__main__":
+    generate()
@@ -0,0 +1,87 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+
+Checks that every parser backend produces the same output for the same page.
+
+    python -m benchmarks.parity page.html [page.html ...] --url https://en.wikipedia.org/wiki/X
+    python -m benchmarks.parity    # every benchmark fixture, each parsed as its own URL, and EDGE_CASES
+"""
+import argparse
+import logging
+import os
+import sys
+from scraper.parser import create_parser
+from .fixtures import FIXTURES, FIXTURE_DIR
+
+BACKENDS = ("bs4", "lxml", "stream")
+
+# Small pages with markup the backends have disagreed on, checked along with the fixtures
+EDGE_CASES = {
+    "empty_title": "<html><head><title></title></head><body><main>Body text "
+                   "<a href='/next'>next</a></main></body></html>",
+    "whitespace_title": "<html><head><title> \n </title></head><body><p>Body text</p></body></html>",
+    "missing_title": "<html><body><article>Only an article</article></body></html>",
+}
+
+def _normalize(result):
+    if result is None:
+        return None
+    result = dict(result)
+    # Link order comes from a set and is not part of the contract
+    result["links"] = sorted(result["links"])
+    return result
+
+def compare(html_content, url, backends=BACKENDS):
+    """Returns the output fields that differ between the backends"""
+    results = {backend: _normalize(create_parser(backend).parse(html_content, url)) for backend in backends}
+    reference_backend, reference = backends[0], results[backends[0]]
+    differences = []
+    for backend in backends[1:]:
+        result = results[backend]
+        if result is None or reference is None:
+            if result is not reference:
+                differences.append(f"{backend} returned {result!r}, {reference_backend} returned {reference!r}")
+            continue
+        for field in reference:
+            if result.get(field) != reference[field]:
+                differences.append(f"{field}: {backend} differs from {reference_backend}")
+    return differences
+
+def _read(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare parser backend output")
+    parser.add_argument("paths", nargs="*", help="HTML files to parse (default: the benchmark fixtures)")
+    parser.add_argument("--url", default="https://example.com/", help="URL the pages are parsed as")
+    args = parser.parse_args(argv)
+
+    if args.paths:
+        pages = [(path, _read(path), args.url) for path in args.paths]
+    else:
+        pages = [(file_name, _read(os.path.join(FIXTURE_DIR, file_name)), url)
+                 for url, file_name in FIXTURES.values()]
+        pages += [(name, html_content, "https://example.com/") for name, html_content in EDGE_CASES.items()]
+
+    logging.basicConfig(level=logging.WARNING)
+    failures = 0
+    for name, html_content, url in pages:
+        differences = compare(html_content, url)
+        if differences:
+            failures += 1
+            print(f"MISMATCH {name}")
+            for difference in differences:
+                print(f"    {difference}")
+    print(f"{len(pages) - failures}/{len(pages)} pages identical across {', '.join(BACKENDS)}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+
+Offline benchmark suite. Each case runs in its own process so peak RSS belongs to that
+case alone, and results are compared with benchmarks/baseline.json.
+
+    python -m benchmarks.run                    # run everything, exit 1 on a regression
+    python -m benchmarks.run --case spider      # run a single case
+    python -m benchmarks.run --update-baseline  # store the results as the new baseline
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Metrics where a bigger number is an improvement; every other metric should shrink
+HIGHER_IS_BETTER = {"pages_per_sec"}
+COMPARED_METRICS = ("pages_per_sec", "p50_ms", "p99_ms", "peak_rss_mb", "import_ms", "init_ms")
+
+# Time main.py may spend importing and constructing the Spider before it does any work
+STARTUP_BUDGET_MS = 500
+
+# Settings that change what a case measures; results are only comparable when they match
+SETTINGS = ("iterations", "pages", "db_pages", "domains", "latency", "error_rate", "workers")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+def summarize(latencies, elapsed, pages):
+    """Turns per-page latencies (seconds) into the reported metrics"""
+    return {
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+    }
+
+def peak_rss_mb():
+    """Peak resident memory of this process or of its largest child (the parser workers)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _timed(function, items):
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        started = time.perf_counter()
+        function(*item)
+        latencies.append(time.perf_counter() - started)
+    return latencies, time.perf_counter() - start
+
+def bench_parse(backend, args, generic=False):
+    """Parser.parse over every fixture; generic parses them under a URL without a domain rule"""
+    from scraper.parser import create_parser
+    from .fixtures import load_all
+
+    parser = create_parser(backend)
+    fixtures = [(html, "https://example.com/" if generic else url) for url, html in load_all().values()]
+    # One untimed pass warms up imports, selector caches and the allocator
+    _timed(parser.parse, fixtures)
+    pages = fixtures * args.iterations
+    latencies, elapsed = _timed(parser.parse, pages)
+    return summarize(latencies, elapsed, len(pages))
+
+def bench_links(backend, args):
+    """Parser._extract_links on pre-parsed documents, so only link extraction is timed"""
+    from scraper.parser import create_parser
+    from .fixtures import load_all
+
+    parser = create_parser(backend)
+    if backend == "lxml":
+        import lxml.html
+        documents = [(lxml.html.document_fromstring(html.encode("utf-8")), url)
+                     for url, html in load_all().values()]
+    else:
+        from bs4 import BeautifulSoup
+        documents = [(BeautifulSoup(html, 'lxml'), url) for url, html in load_all().values()]
+
+    _timed(parser._extract_links, documents)
+    # Link extraction takes a few milliseconds, so it gets more passes than a full parse
+    pages = documents * args.iterations * 10
+    latencies, elapsed = _timed(parser._extract_links, pages)
+    return summarize(latencies, elapsed, len(pages))
+
+def bench_database(args):
+    """The Database calls a successful page makes, until everything is committed"""
+    from scraper.parser import create_parser
+    from utils.database import Database
+    from .fixtures import load_all
+
+    parser = create_parser("lxml")
+    parsed = [(url, len(html), parser.parse(html, url)) for url, html in load_all().values()]
+
+    def save(page, url, size, data):
+        page_url = f"{url}?page={page}"
+        database.save_content(page_url, data["domain"], data["title"], data["content"], data["links"])
+        if data["movies"]:
+            database.save_imdb_movies(data["movies"], page_url)
+        database.log_request(page_url, "success", size)
+        database.save_validators(page_url, None, None, f"{page:064x}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Database(os.path.join(directory, "bench.db"))
+        pages = [(page,) + parsed[page % len(parsed)] for page in range(args.db_pages)]
+        start = time.perf_counter()
+        # Latencies are the producer side: how long a page waits on the write queue
+        latencies, _ = _timed(save, pages)
+        database.flush()
+        elapsed = time.perf_counter() - start
+        database.close()
+    return summarize(latencies, elapsed, len(pages))
+
+def bench_spider(args):
+    """Spider.run end to end against local fixture servers, one per simulated domain"""
+    import sqlite3
+    import config
+    from .server import FixtureServer
+    from .fixtures import FIXTURES
+
+    directory = tempfile.mkdtemp(prefix="bench-")
+    # Scraper modules bind config values at import time, so overrides come first
+    config.RATE_CONTROL_CONFIG.update(initial_delay=0, min_delay=0)
+    config.BROWSER_POOL_SIZE = 0
+    config.CRAWL_MAX_DEPTH = 0
+    config.CRAWL_MAX_PAGES_PER_DOMAIN = args.pages
+    config.FRONTIER_CONFIG["path"] = os.path.join(directory, "frontier.db")
+    config.ARCHIVE_CONFIG["directory"] = os.path.join(directory, "archive")
+    from scraper.spider import Spider
+
+    servers = [FixtureServer(latency=args.latency, error_rate=args.error_rate, seed=i).start()
+               for i in range(args.domains)]
+    try:
+        names = list(FIXTURES)
+        urls = [servers[page % len(servers)].url(names[page % len(names)], page) for page in range(args.pages)]
+        db_path = os.path.join(directory, "bench.db")
+        spider = Spider(urls, {"path": db_path}, workers=args.workers)
+
+        latencies = []
+        fetch = spider.request_handler.fetch
+        def timed_fetch(*fetch_args, **fetch_kwargs):
+            started = time.perf_counter()
+            try:
+                return fetch(*fetch_args, **fetch_kwargs)
+            finally:
+                latencies.append(time.perf_counter() - started)
+        spider.request_handler.fetch = timed_fetch
+
+        start = time.perf_counter()
+        spider.run()
+        elapsed = time.perf_counter() - start
+    finally:
+        for server in servers:
+            server.stop()
+
+    connection = sqlite3.connect(db_path)
+    statuses = dict(connection.execute("SELECT status, COUNT(*) FROM scraping_log GROUP BY status"))
+    from utils.database import STAGE_COLUMNS
+    averages = connection.execute(
+        f"SELECT {', '.join(f'AVG({column})' for column in STAGE_COLUMNS)} FROM scraping_log").fetchone()
+    connection.close()
+    shutil.rmtree(directory, ignore_errors=True)
+    result = summarize(latencies, elapsed, statuses.get("success", 0))
+    result["statuses"] = statuses
+    result["stage_ms"] = {column[:-3]: round(value, 2)
+                          for column, value in zip(STAGE_COLUMNS, averages) if value is not None}
+    return result
+
+def _import_times(module):
+    """Runs a fresh `python -X importtime -c 'import module'` and returns {module: cumulative ms}"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, check=True, cwd=PROJECT_ROOT)
+    times = {}
+    for line in completed.stderr.splitlines():
+        parts = line.split("|")
+        if line.startswith("import time:") and len(parts) == 3 and parts[1].strip().isdigit():
+            times[parts[2].strip()] = int(parts[1]) / 1000
+    return times
+
+def bench_startup(args):
+    """Import time of main.py (median of several fresh interpreters) and Spider construction time"""
+    runs = [_import_times("main") for _ in range(5)]
+    runs.sort(key=lambda times: times["main"])
+    median = runs[len(runs) // 2]
+    slowest = sorted(((name, ms) for name, ms in median.items() if name != "main"),
+                     key=lambda item: item[1], reverse=True)[:10]
+
+    import config
+    directory = tempfile.mkdtemp(prefix="bench-")
+    config.FRONTIER_CONFIG["path"] = os.path.join(directory, "frontier.db")
+    config.ARCHIVE_CONFIG["directory"] = os.path.join(directory, "archive")
+    from scraper.spider import Spider
+
+    start = time.perf_counter()
+    spider = Spider([], {"path": os.path.join(directory, "bench.db")})
+    init_ms = (time.perf_counter() - start) * 1000
+    spider.request_handler.close()
+    spider.parser_pool.close()
+    spider.frontier.close()
+    spider.database.close()
+    shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        "import_ms": round(median["main"], 1),
+        "init_ms": round(init_ms, 1),
+        "slowest_imports": [[name, round(ms, 1)] for name, ms in slowest],
+    }
+
+CASES = {
+    "parse_bs4": lambda args: bench_parse("bs4", args),
+    "parse_lxml": lambda args: bench_parse("lxml", args),
+    # The stream backend hands pages with a domain rule to lxml, so it is timed on generic pages
+    "parse_stream": lambda args: bench_parse("stream", args, generic=True),
+    "links_bs4": lambda args: bench_links("bs4", args),
+    "links_lxml": lambda args: bench_links("lxml", args),
+    "database": bench_database,
+    "spider": bench_spider,
+    "startup": bench_startup,
+}
+
+
+def run_case(name, args):
+    """Runs one case in a fresh interpreter and returns its metrics"""
+    command = [sys.executable, "-m", "benchmarks.run", "--child", name]
+    for setting in SETTINGS:
+        command += [f"--{setting.replace('_', '-')}", str(getattr(args, setting))]
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=PROJECT_ROOT)
+    if completed.returncode != 0:
+        logging.error(f"Benchmark {name} failed:\n{completed.stderr}")
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def over_budget(results, budget_ms):
+    """Startup time is checked against a fixed budget as well as against the baseline"""
+    startup = results.get("startup")
+    if not startup:
+        return []
+    total = startup["import_ms"] + startup["init_ms"]
+    if total > budget_ms:
+        return [f"startup: {total:.0f} ms exceeds the {budget_ms} ms budget"]
+    return []
+
+def compare(results, baseline, tolerance):
+    """Returns a description of every metric that is worse than the baseline by more than tolerance"""
+    regressions = []
+    for name, metrics in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if not metrics or not reference:
+            continue
+        for metric in COMPARED_METRICS:
+            new, old = metrics.get(metric), reference.get(metric)
+            if not new or not old:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > tolerance:
+                regressions.append(f"{name}.{metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baseline(results, settings):
+    baseline = load_baseline()
+    if baseline.get("settings") != settings:
+        baseline = {}
+    baseline["settings"] = settings
+    baseline.setdefault("results", {}).update({name: metrics for name, metrics in results.items() if metrics})
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def print_table(results):
+    print(f"{'case':<12} {'pages/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'peak MB':>9}")
+    for name, metrics in results.items():
+        if not metrics:
+            print(f"{name:<12} {'failed':>10}")
+            continue
+        row = [metrics.get(metric) for metric in COMPARED_METRICS]
+        print(f"{name:<12} " + " ".join(f"{'-' if v is None else v:>{w}}" for v, w in zip(row, (10, 10, 10, 9))))
+        if "statuses" in metrics:
+            print(f"{'':<12} statuses: {metrics['statuses']}")
+        if "stage_ms" in metrics:
+            print(f"{'':<12} mean stage ms: {metrics['stage_ms']}")
+        if "import_ms" in metrics:
+            print(f"{'':<12} import {metrics['import_ms']} ms, Spider() {metrics['init_ms']} ms, slowest imports:")
+            for module, ms in metrics["slowest_imports"]:
+                print(f"{'':<14}{ms:>8} ms  {module}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmarks")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="Case to run, repeatable (default: all)")
+    parser.add_argument("--iterations", type=int, default=20, help="Passes over the fixtures for parse cases")
+    parser.add_argument("--pages", type=int, default=200, help="Pages crawled by the spider case")
+    parser.add_argument("--db-pages", type=int, default=5000, help="Pages written by the database case")
+    parser.add_argument("--domains", type=int, default=4, help="Fixture servers, each one a separate domain")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the fixture servers add to a response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of fixture responses failing with 503")
+    parser.add_argument("--workers", type=int, default=4, help="Spider fetch workers")
+    parser.add_argument("--startup-budget-ms", type=int, default=STARTUP_BUDGET_MS,
+                        help="Import plus Spider construction time allowed for main.py")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a metric is a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the baseline")
+    parser.add_argument("--child", choices=sorted(CASES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        logging.basicConfig(level=logging.CRITICAL)
+        result = CASES[args.child](args)
+        result["peak_rss_mb"] = peak_rss_mb()
+        print(json.dumps(result))
+        return 0
+
+    logging.basicConfig(level=logging.WARNING)
+    settings = {setting: getattr(args, setting) for setting in SETTINGS}
+    results = {name: run_case(name, args) for name in (args.case or CASES)}
+    print_table(results)
+
+    if args.update_baseline:
+        save_baseline(results, settings)
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0 if all(results.values()) else 1
+
+    regressions = over_budget(results, args.startup_budget_ms)
+    baseline = load_baseline()
+    if not baseline:
+        print("No baseline yet, run with --update-baseline to create one")
+    elif baseline.get("settings") != settings:
+        print(f"Settings differ from the baseline {baseline.get('settings')}, comparison skipped")
+    else:
+        regressions += compare(results, baseline, args.tolerance)
+        if not regressions:
+            print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions or not all(results.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+
+Local HTTP server that serves the benchmark fixtures, so crawls can be timed without
+touching live sites. Any path below a fixture name serves that fixture, e.g.
+/imdb/17 returns the IMDb chart, which gives a crawl as many distinct URLs as it needs.
+
+    python -m benchmarks.server --port 8700 --latency 0.05 --error-rate 0.1
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .fixtures import load_all
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        name = self.path.strip("/").split("/", 1)[0]
+        if name not in server.pages:
+            self._respond(404, b"not found", "text/plain")
+        elif server.should_fail():
+            self._respond(503, b"injected failure", "text/plain")
+        else:
+            self._respond(200, server.pages[name], "text/html; charset=utf-8")
+
+    def _respond(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency, error_rate, seed):
+        super().__init__(address, _FixtureHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.pages = {name: html.encode("utf-8") for name, (_, html) in load_all().items()}
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def should_fail(self):
+        if not self.error_rate:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.error_rate
+
+
+class FixtureServer:
+    """
+    Serves the fixtures on 127.0.0.1 from a background thread.
+    Every response waits `latency` seconds and a seeded `error_rate` share of page
+    requests fails with 503, so repeated runs inject the same failures.
+    """
+
+    def __init__(self, port=0, latency=0.0, error_rate=0.0, seed=0):
+        self._server = _Server(("127.0.0.1", port), latency, error_rate, seed)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def url(self, name, page=0):
+        return f"{self.base_url}/{name}/{page}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the benchmark fixtures over HTTP")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    args = parser.parse_args(argv)
+
+    with FixtureServer(args.port, args.latency, args.error_rate) as server:
+        print(f"Serving fixtures on {server.base_url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
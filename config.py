@@ -20,7 +20,17 @@ TARGET_URLS = [
 
 DATABASE_CONFIG = {
     "type": "sqlite",
-    "path": "data/scraped_data.db"
+    "path": "data/scraped_data.db",
+    "batch_size": 500, # Max queued records committed in one transaction
+    "flush_interval": 1.0, # Max seconds a queued record waits before being committed
+    "queue_size": 10000, # Producers block once this many records are waiting
+    "synchronous": "NORMAL", # SQLite synchronous pragma (NORMAL is safe with WAL)
+    "cache_size_kb": 65536, # SQLite page cache size
+    "compression": "zlib", # Page content compression: "zstd" (needs zstandard), "zlib" or "none"
+    "compression_level": None, # None uses the library default
+    "compress_min_bytes": 256, # Shorter content is stored uncompressed
+    "busy_timeout": 30, # Seconds to wait while another worker process writes
+    "journal_mode": "WAL" # WAL needs all processes on one host; use "DELETE" on a shared filesystem
 }
 
 # Define request timeout and max retries
@@ -29,6 +39,206 @@ MAX_RETRIES = 5
 
 # Selenium WebDriver settings
 SELENIUM_HEADLESS = False # Run browser in headless mode
-SELENIUM_WAIT_TIMEOUT = 30 # Max time to wait for page elements to load
+SELENIUM_WAIT_TIMEOUT = 30 # Max time to wait for a page to become ready, scrolling included
+
+# Page readiness: a rendered page is ready once the DOM and the network have settled
+READINESS_CONFIG = {
+    "quiet_period": 0.5, # Seconds without DOM changes or network activity
+    "max_inflight": 2, # Open requests still counted as idle (long polling, beacons)
+    "poll_interval": 0.1, # Seconds between readiness checks
+    "max_scrolls": 10, # Viewport-sized scroll steps on pages that keep growing
+    "scroll_settle": 2.0 # Max seconds to wait for new content after each scroll step
+}
+# Per-domain readiness rules: a selector that must be present, plus READINESS_CONFIG overrides
+READINESS_RULES = {
+    "imdb.com": {"selector": ".ipc-metadata-list, .lister-list"},
+    "unsplash.com": {"selector": "figure img", "max_scrolls": 5}, # Infinite scroll
+    "github.com": {"selector": "main"},
+    "wikipedia.org": {"selector": "#mw-content-text", "max_scrolls": 0},
+}
+
+# Resource blocking in the browser: requests matching these URL patterns are never sent
+BLOCKED_RESOURCE_PATTERNS = {
+    "media": ["*.mp4", "*.webm", "*.m4v", "*.mov", "*.mp3", "*.m4a", "*.ogg", "*.wav", "*.m3u8"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico", "*.bmp"],
+    "trackers": ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+                 "*connect.facebook.net*", "*hotjar.com*", "*scorecardresearch.com*"],
+}
+RESOURCE_BLOCKING_DEFAULT = ["media", "fonts"] # Profile of domains not listed below
+RESOURCE_BLOCKING_PROFILES = {
+    # Image alt text and <img> tags are still in the DOM, only the downloads are skipped
+    "imdb.com": ["media", "fonts", "images", "trackers"],
+    "unsplash.com": ["media", "fonts", "images", "trackers"],
+}
 
 PROXY_LIST = []
+PROXY_TEST_URL = "https://www.google.com" # Endpoint proxies are validated against, can be a local server
+PROXY_VALIDATION_TIMEOUT = 5 # Seconds before a proxy fails validation
+PROXY_VALIDATION_WORKERS = 20 # Proxies validated in parallel
+PROXY_HEALTH_CONFIG = {
+    "alpha": 0.3, # Weight of the latest fetch in the rolling success rate and latency
+    "latency_scale": 5.0, # A proxy this many seconds slow scores half of an instant one
+    "cooldown_after": 3, # Consecutive failures before a proxy is cooled down
+    "cooldown_seconds": 60, # First cooldown, doubled on every further one
+    "max_cooldowns": 3 # A proxy failing again after this many cooldowns is evicted
+}
+
+# HTTP fetch tier (plain requests are tried before the browser)
+HTTP_FETCH_ENABLED = True
+HTTP_POOL_CONNECTIONS = 10 # Number of per-host connection pools kept alive
+HTTP_POOL_MAXSIZE = 10 # Max pooled connections per host
+MIN_CONTENT_LENGTH = 1000 # Pages smaller than this are treated as incomplete
+MAX_PAGE_BYTES = 5 * 1024 * 1024 # Fetched pages are cut off after this much HTML and stored as truncated
+
+# Domains that always need JavaScript rendering in the browser
+BROWSER_ONLY_DOMAINS = [
+    "imdb.com",
+    "unsplash.com",
+]
+
+# Selector that must be present in an HTTP response, otherwise the page is re-fetched in the browser
+EXPECTED_SELECTORS = {
+    "imdb.com": ".ipc-metadata-list, .lister-list",
+    "wikipedia.org": "#mw-content-text",
+    "github.com": "main",
+}
+
+# Concurrency and politeness
+SPIDER_WORKERS = 4 # Number of URLs fetched in parallel
+MAX_CONCURRENT_PER_DOMAIN = 1 # Parallel fetches allowed against a single domain
+RATE_CONTROL_CONFIG = {
+    "initial_delay": 3.0, # Seconds between requests to a domain before it has responded
+    "min_delay": 1.0, # Fastest pace a healthy domain can reach
+    "max_delay": 120.0, # Slowest pace after repeated throttling
+    "backoff_delay": 2.0, # Minimum delay right after a throttling signal
+    "increase_step": 0.05, # Requests per second added to a domain's rate per healthy response
+    "decrease_factor": 0.5, # Rate multiplier on a throttling signal
+    "slow_response": 10.0, # Responses slower than this (seconds) count as throttling
+    "min_content_length": MIN_CONTENT_LENGTH, # Smaller rendered pages count as throttling
+    "jitter": 0.3, # Delays vary randomly by this fraction
+    "max_retry_after": 600, # Upper bound honored for Retry-After headers (seconds)
+    "retry_ratio": 0.2, # Retries a domain earns per healthy response
+    "retry_max_tokens": 10 # Retries a domain can bank, shared by all workers
+}
+RESPECT_ROBOTS_TXT = True # Skip disallowed URLs and honor crawl-delay
+
+# Browser pool
+BROWSER_POOL_SIZE = 2 # Warm Chrome instances kept ready for rendering, 0 disables the browser fallback
+BROWSER_MAX_PAGES = 50 # Recycle a browser after this many pages
+BROWSER_MAX_MEMORY_MB = 1500 # Recycle a browser above this resident memory
+BROWSER_HEALTH_CHECK_INTERVAL = 30 # Seconds between health checks of idle browsers
+BROWSER_LEASE_TIMEOUT = 120 # Max seconds a fetch waits for a free browser
+
+# Crawl frontier (link following)
+FRONTIER_CONFIG = {
+    "path": "data/frontier.db",
+    "bloom_capacity": 1000000, # Expected number of distinct URLs per crawl
+    "bloom_error_rate": 0.001, # False positive rate of URL deduplication
+    "bloom_save_interval": 1000, # Persist the dedup filter after this many new URLs
+    "lease_timeout": 60, # Seconds before work leased by a dead process goes back to the queue
+    "max_leased_domains": 8, # Domains one `main.py worker` process crawls at a time
+    "busy_timeout": 30, # Seconds to wait for another process's write lock
+    "journal_mode": "WAL" # WAL needs all processes on one host; use "DELETE" for a frontier on a shared filesystem
+}
+CRAWL_MAX_DEPTH = 1 # 0 only fetches TARGET_URLS, 1 also follows their links, etc.
+CRAWL_MAX_PAGES_PER_DOMAIN = 100 # Max URLs queued per domain in one crawl
+CRAWL_SAME_SITE_ONLY = True # Only follow links within the sites of TARGET_URLS
+CRAWL_MAX_ATTEMPTS = 3 # Failed URLs are retried on --resume until they were tried this often
+
+# Export
+EXPORT_CHUNK_SIZE = 100 # Rows read and written at a time; memory of an export is about this many pages
+
+# Re-parsing stored pages (`main.py reparse`)
+REPARSE_CHUNK_SIZE = 500 # Stale pages looked up at a time; pages in memory are bounded by PARSER_MAX_IN_FLIGHT
+
+# Raw page archive: fetched HTML is kept in WARC segments so pages can be re-parsed without re-fetching
+ARCHIVE_CONFIG = {
+    "enabled": True,
+    "directory": "data/archive",
+    "segment_size": 256 * 1024 * 1024, # Start a new segment once the current one is this many bytes
+    "compression_level": 6, # gzip level of each record
+}
+
+# Metrics and profiling
+METRICS_CONFIG = {
+    "http_port": None, # Serve Prometheus text on http://127.0.0.1:<port>/metrics, None disables
+    "http_host": "127.0.0.1",
+    "json_path": None, # JSON dump rewritten every json_interval seconds, e.g. "logs/metrics.json"
+    "json_interval": 10,
+    "profile_stages": [], # Stages run under cProfile: queue, fetch, acquire, navigate, ready, backoff, parse, save, archive or db_write
+    "profile_dir": "logs/profiles" # One .prof file per profiled stage and process
+}
+
+# Parsing stage
+PARSER_WORKERS = max(1, (os.cpu_count() or 2) - 1) # Parser processes, 0 parses inline in the fetch threads
+PARSER_MAX_IN_FLIGHT = 16 # Pages waiting for a parser before fetching is paused
+PARSER_BACKEND = "bs4" # "bs4" (BeautifulSoup), "lxml" (faster, same output) or "stream" (one pass in bounded memory, pages with a domain rule go to lxml)
+PARSER_MAX_ELEMENTS = 200000 # The stream backend stops reading a page after this many elements
+STREAM_CHUNK_BYTES = 64 * 1024 # HTML fed to the stream backend's incremental parser at a time
+
+# Domain extraction rules, keyed by host suffix (the most specific suffix wins). Each host has
+# a list of rules; the first whose "path" regex matches the URL path (None matches any) is used.
+#   name: stored as the page's extractor, defaults to the host suffix
+#   version: bump when the rule's output changes, `main.py reparse` then re-extracts its pages;
+#     rules with the same name must have the same version
+#   sections: content lines "<label>: <value>, <value>, ..." from the text (or attribute) of every match
+#   records: typed records, one per row match, from the first layout whose "rows" selector matches.
+#     Fields take the text (or attribute) of match number "index" (default 0) of their selector in
+#     the row, optionally keep only what follows "after", strip "strip" characters and convert to
+#     "type" (str, int, float, or list for the texts of all matches); "default" when nothing matches.
+#     "summary" formats the first "summary_limit" records as content lines. "store" saves them to
+#     the imdb_movies table or, with "records", as JSON in extracted_records.
+# Pages without content from their rule, and pages without a rule, get the generic main-content text.
+IMDB_CHART_RECORDS = {
+    "name": "movies",
+    "layouts": [  # Newest first
+        {
+            "rows": ".ipc-metadata-list-summary-item",
+            "fields": {
+                "title": {"selector": ".ipc-title__text", "after": ". ", "default": "Unknown"},  # "1. The Shawshank Redemption"
+                "year": {"selector": ".cli-title-metadata-item", "strip": "()", "default": "N/A"},
+                "genre": {"selector": ".ipc-chip-list", "default": "N/A"},
+                "rating": {"selector": ".ipc-rating-star", "default": "N/A"},
+                "duration": {"selector": ".cli-title-metadata-item", "index": 1, "default": "N/A"},
+            },
+        },
+        {
+            "rows": ".lister-list tr",
+            "fields": {
+                "title": {"selector": ".titleColumn a", "default": "Unknown"},
+                "year": {"selector": ".titleColumn span", "strip": "()", "default": "N/A"},
+                "genre": {"default": "N/A"},
+                "rating": {"selector": ".imdbRating strong", "default": "N/A"},
+                "duration": {"default": "N/A"},
+            },
+        },
+    ],
+    "summary": "{title} ({year}) - Rating: {rating}",
+    "summary_limit": 10,
+}
+
+EXTRACTION_RULES = {
+    "imdb.com": [
+        {"path": r"^/chart/top", "version": 1,
+         "records": {**IMDB_CHART_RECORDS, "store": "imdb_movies"}},
+        {"version": 1, "records": IMDB_CHART_RECORDS},
+    ],
+    "wikipedia.org": [
+        {"version": 1, "sections": [
+            {"label": "Categories", "selector": "#mw-subcategories a"},
+            {"label": "Algorithms", "selector": "#mw-pages li"},
+        ]},
+    ],
+    "github.com": [
+        {"version": 1, "sections": [
+            {"label": "Topics", "selector": ".topic-tag"},
+            {"label": "Repositories", "selector": ".text-bold.wb-break-word"},
+        ]},
+    ],
+    "unsplash.com": [
+        {"version": 1, "sections": [
+            {"label": "Images", "selector": "img[alt]", "attribute": "alt"},
+        ]},
+    ],
+}
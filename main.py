@@ -8,16 +8,168 @@ This web scraping tool is intended for educational purposes only. Users are resp
 
 Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
 """
+import argparse
 import logging
+import multiprocessing
+import socket
 import sys
 import time
 import os
 from scraper.spider import Spider
 from utils.logger import setup_logger
-from config import TARGET_URLS, DATABASE_CONFIG
+from utils.export import EXPORT_TABLES, FORMATS
+from config import TARGET_URLS, DATABASE_CONFIG, METRICS_CONFIG
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Web scraper; crawls TARGET_URLS when no command is given")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the last crawl that did not complete instead of starting over")
+    commands = parser.add_subparsers(dest="command")
+    
+    export = commands.add_parser("export", help="Stream a table of the database to JSONL, CSV or Parquet")
+    export.add_argument("table", choices=list(EXPORT_TABLES))
+    export.add_argument("output", help="Output file; the format follows the extension unless --format is given")
+    export.add_argument("--format", choices=FORMATS, help="Parquet needs pyarrow")
+    export.add_argument("--domain", help="Only rows whose URL is on this domain or its subdomains")
+    export.add_argument("--since", help="Only rows stored at or after this UTC time (YYYY-MM-DD[ HH:MM:SS])")
+    export.add_argument("--until", help="Only rows stored before this UTC time")
+    export.add_argument("--watermark", metavar="NAME",
+                        help="Incremental export: only rows added since the last export with this name")
+    export.add_argument("--db", default=DATABASE_CONFIG["path"], help="Database to export from")
+    
+    search = commands.add_parser("search", help="Full-text search over the scraped pages")
+    search.add_argument("query", help='FTS5 query: words, "phrases", prefix*, AND/OR/NOT')
+    search.add_argument("--limit", type=int, default=10)
+    search.add_argument("--domain", help="Only pages on this domain or its subdomains")
+    search.add_argument("--db", default=DATABASE_CONFIG["path"])
+    
+    reindex = commands.add_parser("reindex", help="Rebuild the full-text search index")
+    reindex.add_argument("--db", default=DATABASE_CONFIG["path"])
+    
+    reparse = commands.add_parser(
+        "reparse", help="Re-extract stored pages whose extractor changed, from the archived raw HTML")
+    reparse.add_argument("--domain", help="Only pages on this domain or its subdomains")
+    reparse.add_argument("--db", default=DATABASE_CONFIG["path"])
+    
+    worker = commands.add_parser(
+        "worker", help="Attach crawler processes to the running crawl, starting one if there is none")
+    worker.add_argument("--processes", type=int, default=1,
+                        help="Crawler processes to start on this host; more hosts can attach to a shared frontier")
+    return parser.parse_args(argv)
+
+def open_database(path):
+    """Opens an existing database for the maintenance commands, exits if there is none"""
+    from utils.database import Database
+    
+    if not os.path.exists(path):
+        logging.error(f"No database at {path}")
+        sys.exit(1)
+    return Database(path)
+
+def run_export(args):
+    from utils.export import export_table
+    
+    database = open_database(args.db)
+    try:
+        count = export_table(database, args.table, args.output, args.format, args.domain,
+                             args.since, args.until, args.watermark)
+    finally:
+        database.close()
+    sys.exit(0 if count is not None else 1)
+
+def run_search(args):
+    database = open_database(args.db)
+    try:
+        started = time.perf_counter()
+        results = database.search(args.query, args.limit, args.domain)
+        elapsed = (time.perf_counter() - started) * 1000
+    finally:
+        database.close()
+    # Results go to stdout on their own, the log has the rest
+    for rank, result in enumerate(results, 1):
+        print(f"{rank}. {result['title'] or '(no title)'}  [{result['score']:.2f}]")
+        print(f"   {result['url']}")
+        print(f"   {' '.join(result['snippet'].split())}")
+    print(f"{len(results)} results in {elapsed:.1f} ms")
+
+def run_reindex(args):
+    database = open_database(args.db)
+    try:
+        success = database.rebuild_search_index()
+    finally:
+        database.close()
+    sys.exit(0 if success else 1)
+
+def run_reparse(args):
+    from scraper.reparse import reparse
+    
+    database = open_database(args.db)
+    try:
+        count = reparse(database, args.domain)
+    finally:
+        database.close()
+    sys.exit(0 if count is not None else 1)
+
+def run_workers(args):
+    from scraper.frontier import Frontier
+    from utils.database import Database
+    
+    # Schema and crawl run are settled once, before the processes race for them
+    Database(DATABASE_CONFIG["path"]).close()
+    frontier = Frontier()
+    run_id = frontier.attach_run(TARGET_URLS)
+    frontier.close()
+    logging.info(f"Starting {args.processes} worker processes on crawl run {run_id}")
+    
+    # Fresh interpreters; forking a process that runs threads is unsafe
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=worker_process, args=(index,), name=f"crawler-{index}")
+                 for index in range(args.processes)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # The workers got the interrupt too and hand their leases back before exiting
+        logging.warning("Interrupted, waiting for the workers to release their leases")
+        for process in processes:
+            process.join()
+    failed = sum(1 for process in processes if process.exitcode)
+    logging.info(f"Workers finished ({failed} failed)")
+    sys.exit(1 if failed else 0)
+
+def worker_process(index):
+    """Entry point of one crawler process started by `main.py worker`"""
+    setup_logger(level=logging.INFO, log_file=f"logs/worker-{socket.gethostname()}-{os.getpid()}.log")
+    # Every process publishes its own metrics
+    if METRICS_CONFIG["http_port"] is not None:
+        METRICS_CONFIG["http_port"] += index
+    if METRICS_CONFIG["json_path"]:
+        root, extension = os.path.splitext(METRICS_CONFIG["json_path"])
+        METRICS_CONFIG["json_path"] = f"{root}-{index}{extension}"
+    try:
+        Spider(urls=TARGET_URLS, db_config=DATABASE_CONFIG, shared=True).run()
+    except KeyboardInterrupt:
+        sys.exit(1)
 
 def main():
+    args = parse_args()
+    if args.command == "search":
+        # Keeps the log lines out of the search results
+        setup_logger(level=logging.WARNING)
+        run_search(args)
+        return
     setup_logger(level=logging.INFO)
+    if args.command == "export":
+        run_export(args)
+    if args.command == "reindex":
+        run_reindex(args)
+    if args.command == "reparse":
+        run_reparse(args)
+    if args.command == "worker":
+        os.makedirs("data", exist_ok=True)
+        run_workers(args)
     logging.info("Starting web scraper")
     
     try:
@@ -30,7 +182,7 @@ def main():
             db_config=DATABASE_CONFIG
         )
         
-        spider.run()
+        spider.run(resume=args.resume)
         duration = time.time() - start_time
         
         logging.info(f"Scraping completed in {duration:.2f} seconds")
@@ -39,7 +191,7 @@ def main():
         logging.info(f"Data stored in database: {db_path}")
 
     except KeyboardInterrupt:
-        logging.warning("Scraping interrupted by user")
+        logging.warning("Scraping interrupted by user, continue with --resume")
         sys.exit(1)
     except Exception as e:
         logging.critical(f"Critical failure: {e}", exc_info=True)
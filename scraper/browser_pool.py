@@ -0,0 +1,214 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import logging
+import queue
+import threading
+import time
+from config import (
+    BROWSER_POOL_SIZE, BROWSER_MAX_PAGES, BROWSER_MAX_MEMORY_MB,
+    BROWSER_HEALTH_CHECK_INTERVAL, BROWSER_LEASE_TIMEOUT
+)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+class PooledBrowser:
+    """A warm driver plus the bookkeeping the pool needs to recycle it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created = time.time()
+        self.retired = False
+
+    def retire(self):
+        """Marks the browser to be replaced instead of returned to the pool"""
+        self.retired = True
+
+    def memory_mb(self):
+        """Resident memory of the browser process tree, or None if unknown"""
+        pid = getattr(self.driver, "browser_pid", None)
+        if not pid:
+            return None
+        try:
+            if psutil:
+                process = psutil.Process(pid)
+                processes = [process] + process.children(recursive=True)
+                return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+            # Without psutil only the main browser process is visible
+            with open(f"/proc/{pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024
+        except Exception:
+            return None
+        return None
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    """
+    Keeps a number of warm Chrome instances, leases them to fetch jobs and
+    recycles them after too many pages, too much memory or a failed health check.
+    Replacements are started in the background so callers never wait for a cold start
+    unless every browser is busy being replaced.
+    """
+
+    def __init__(self, driver_factory, size=BROWSER_POOL_SIZE, max_pages=BROWSER_MAX_PAGES,
+                 max_memory_mb=BROWSER_MAX_MEMORY_MB, health_check_interval=BROWSER_HEALTH_CHECK_INTERVAL):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.health_check_interval = health_check_interval
+
+        self._idle = queue.Queue()
+        self._browsers = set()
+        self._starting = 0
+        self._lock = threading.Lock()
+        # undetected-chromedriver patches a shared driver binary, so launches are serialized
+        self._launch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._started = False
+        self._health_thread = None
+
+    def start(self):
+        """Warms up the pool in the background"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        logging.info(f"Starting browser pool with {self.size} browsers")
+        self._top_up()
+        self._health_thread = threading.Thread(target=self._health_loop, name="browser-health", daemon=True)
+        self._health_thread.start()
+
+    def acquire(self, timeout=BROWSER_LEASE_TIMEOUT):
+        """Leases a warm browser, or returns None if none became available in time"""
+        if self.size <= 0:
+            # A pool size of 0 turns the browser fallback off
+            return None
+        self.start()
+        deadline = time.monotonic() + timeout
+        while not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                return self._idle.get(timeout=min(remaining, 1))
+            except queue.Empty:
+                with self._lock:
+                    nothing_coming = not self._browsers and not self._starting
+                if nothing_coming:
+                    # Every launch failed; try again rather than waiting for the health check
+                    self._top_up()
+        logging.error("No browser became available from the pool")
+        return None
+
+    def release(self, browser):
+        """Returns a leased browser, recycling it if it is worn out"""
+        browser.pages += 1
+        if self._stop.is_set():
+            self._discard(browser)
+        elif browser.retired or self._worn_out(browser):
+            logging.info(f"Recycling browser after {browser.pages} pages")
+            self._discard(browser)
+            self._top_up()
+        else:
+            self._idle.put(browser)
+
+    def close(self):
+        self._stop.set()
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            remaining = list(self._browsers)
+        for browser in remaining:
+            self._discard(browser)
+        if self._started:
+            logging.info("Browser pool closed")
+
+    def _worn_out(self, browser):
+        if self.max_pages and browser.pages >= self.max_pages:
+            return True
+        if self.max_memory_mb:
+            memory = browser.memory_mb()
+            if memory is not None and memory > self.max_memory_mb:
+                logging.info(f"Browser is using {memory:.0f} MB, above the {self.max_memory_mb} MB ceiling")
+                return True
+        return False
+
+    def _healthy(self, browser):
+        try:
+            return browser.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _discard(self, browser):
+        with self._lock:
+            self._browsers.discard(browser)
+        browser.quit()
+
+    def _top_up(self):
+        """Launches replacements until the pool is back at its configured size"""
+        with self._lock:
+            missing = self.size - len(self._browsers) - self._starting
+            self._starting += max(missing, 0)
+        for _ in range(missing):
+            threading.Thread(target=self._launch, name="browser-launch", daemon=True).start()
+
+    def _launch(self):
+        driver = None
+        try:
+            if not self._stop.is_set():
+                with self._launch_lock:
+                    driver = self.driver_factory()
+        finally:
+            with self._lock:
+                self._starting -= 1
+                browser = PooledBrowser(driver) if driver else None
+                if browser and not self._stop.is_set():
+                    self._browsers.add(browser)
+        if browser is None:
+            return
+        if self._stop.is_set():
+            browser.quit()
+        else:
+            self._idle.put(browser)
+
+    def _health_loop(self):
+        while not self._stop.wait(self.health_check_interval):
+            # Only idle browsers are checked; leased ones are in use by a fetch
+            checked = []
+            while True:
+                try:
+                    checked.append(self._idle.get_nowait())
+                except queue.Empty:
+                    break
+            for browser in checked:
+                if not self._healthy(browser):
+                    logging.warning("Browser failed its health check, replacing it")
+                    self._discard(browser)
+                elif self._worn_out(browser):
+                    self._discard(browser)
+                else:
+                    self._idle.put(browser)
+            self._top_up()
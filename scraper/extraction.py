@@ -0,0 +1,206 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import logging
+import re
+from urllib.parse import urlparse
+from config import EXTRACTION_RULES
+
+# Bump a version whenever the output it covers changes; `main.py reparse` re-extracts
+# stored pages whose version is out of date. PARSER_VERSION covers the code every page
+# goes through (title, links), GENERIC_VERSION the generic main-content extraction.
+# Domain rules carry their own version in EXTRACTION_RULES.
+PARSER_VERSION = 1
+GENERIC_VERSION = 1
+GENERIC_EXTRACTOR = "generic"
+GENERIC_PARSER_VERSION = f"{PARSER_VERSION}.{GENERIC_VERSION}"
+
+NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+def current_versions(rules=EXTRACTION_RULES):
+    """Extractor name -> version stored with the pages it extracts, e.g. '1.3'"""
+    versions = {GENERIC_EXTRACTOR: GENERIC_PARSER_VERSION}
+    for suffix, host_rules in rules.items():
+        for rule in host_rules:
+            versions[rule.get("name", suffix)] = f"{PARSER_VERSION}.{rule.get('version', 1)}"
+    return versions
+
+def _convert(value, field_type):
+    """Converts a field's text to its declared type, None if it does not convert"""
+    if field_type in ("int", "float"):
+        match = NUMBER.search(value.replace(",", ""))
+        if not match:
+            return None
+        number = float(match.group())
+        return int(number) if field_type == "int" else number
+    return value
+
+
+class HostTrie:
+    """Maps host suffixes to values; a lookup walks the host's labels once, right to left"""
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, suffix, value):
+        node = self.root
+        for label in reversed(suffix.lower().split(".")):
+            node = node.setdefault(label, {})
+        node[None] = value
+
+    def lookup(self, host):
+        """Value of the longest suffix the host is or is a subdomain of, or None"""
+        node = self.root
+        found = None
+        for label in reversed(host.lower().split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+
+class Rule:
+    """
+    One entry of EXTRACTION_RULES with its selectors compiled for a parser backend.
+    The backend supplies compile_selector, returning a callable that lists the matches
+    under a node, and text, returning a node's stripped text.
+    """
+
+    def __init__(self, suffix, spec, compile_selector, text):
+        self.name = spec.get("name", suffix)
+        self.version = f"{PARSER_VERSION}.{spec.get('version', 1)}"
+        self.path = re.compile(spec["path"]) if spec.get("path") else None
+        self.text = text
+        self.sections = [(section["label"], compile_selector(section["selector"]), section.get("attribute"))
+                         for section in spec.get("sections", [])]
+        records = spec.get("records")
+        self.records = None
+        if records:
+            self.records = {
+                "name": records["name"],
+                "store": records.get("store"),
+                "summary": records.get("summary"),
+                "summary_limit": records.get("summary_limit"),
+                # Selector strings shared by several fields compile to one selector, so a row
+                # is searched once per distinct selector
+                "layouts": [(compile_selector(layout["rows"]), self._compile_fields(layout["fields"], compile_selector))
+                            for layout in records["layouts"]],
+            }
+
+    @staticmethod
+    def _compile_fields(fields, compile_selector):
+        selectors = {}
+        compiled = {}
+        for name, field in fields.items():
+            css = field.get("selector")
+            if css and css not in selectors:
+                selectors[css] = compile_selector(css)
+            compiled[name] = {**field, "selector": selectors.get(css), "key": css}
+        return compiled
+
+    def matches(self, path):
+        return self.path is None or self.path.search(path) is not None
+
+    def extract_records(self, root):
+        """Records of the first layout with rows on the page, [] if there are none"""
+        if not self.records:
+            return []
+        try:
+            # Detect the layout once instead of trying every fallback on every row
+            for rows_selector, fields in self.records["layouts"]:
+                rows = rows_selector(root)
+                if rows:
+                    break
+            else:
+                return []
+            records = [self._extract_record(row, fields) for row in rows]
+            logging.info(f"Extracted {len(records)} {self.records['name']} with the {self.name} rule")
+            return records
+        except Exception as e:
+            logging.error(f"Record extraction of the {self.name} rule failed: {e}")
+            return []
+
+    def _extract_record(self, row, fields):
+        matches = {}
+        record = {}
+        for name, field in fields.items():
+            selector = field["selector"]
+            if selector is None:
+                record[name] = field.get("default")
+                continue
+            if field["key"] not in matches:
+                matches[field["key"]] = selector(row)
+            found = matches[field["key"]]
+
+            if field.get("type") == "list":
+                record[name] = [self._value(element, field) for element in found]
+                continue
+            index = field.get("index", 0)
+            if index >= len(found):
+                record[name] = field.get("default")
+                continue
+            value = self._value(found[index], field)
+            if field.get("type") in ("int", "float"):
+                value = _convert(value, field["type"])
+                record[name] = field.get("default") if value is None else value
+            else:
+                record[name] = value
+        return record
+
+    def _value(self, element, field):
+        value = element.get(field["attribute"], "") if field.get("attribute") else self.text(element)
+        after = field.get("after")
+        if after and after in value:
+            value = value.split(after, 1)[1]
+        if field.get("strip"):
+            value = value.strip(field["strip"])
+        return value
+
+    def content_lines(self, root, records):
+        """The rule's section lines followed by the summary lines of its records"""
+        lines = []
+        for label, selector, attribute in self.sections:
+            values = [element.get(attribute, "") if attribute else self.text(element) for element in selector(root)]
+            if values:
+                lines.append(f"{label}: " + ", ".join(values))
+        if self.records and self.records["summary"]:
+            limit = self.records["summary_limit"]
+            lines += [self.records["summary"].format(**record) for record in records[:limit]]
+        return lines
+
+    def stored_records(self, records):
+        """(IMDb movies, {name: records} for extracted_records) to save with the page"""
+        store = self.records["store"] if self.records else None
+        if store == "imdb_movies":
+            return records, {}
+        if store == "records" and records:
+            return [], {self.records["name"]: records}
+        return [], {}
+
+
+class ExtractionRegistry:
+    """
+    EXTRACTION_RULES compiled for one parser backend. Resolving a URL costs one walk
+    over its host labels plus the path patterns of that host, however many rules exist.
+    """
+
+    def __init__(self, compile_selector, text, rules=EXTRACTION_RULES):
+        self.trie = HostTrie()
+        for suffix, host_rules in rules.items():
+            self.trie.insert(suffix, [Rule(suffix, spec, compile_selector, text) for spec in host_rules])
+
+    def resolve(self, url):
+        """The rule for a URL, or None if the generic extraction applies"""
+        parsed = urlparse(url)
+        for rule in self.trie.lookup(parsed.hostname or "") or ():
+            if rule.matches(parsed.path):
+                return rule
+        return None
@@ -0,0 +1,462 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from urllib.parse import urldefrag, urlparse
+from config import (
+    FRONTIER_CONFIG, CRAWL_MAX_DEPTH, CRAWL_MAX_PAGES_PER_DOMAIN, CRAWL_SAME_SITE_ONLY, CRAWL_MAX_ATTEMPTS
+)
+from utils.bloom_filter import BloomFilter
+from utils.domains import domain_matches
+
+class Frontier:
+    """
+    Disk-backed crawl frontier, shareable by several crawler processes.
+    URLs wait in an SQLite priority queue, so memory stays flat however many
+    links are discovered, and a Bloom filter rejects already-seen URLs without a lookup.
+    Every state change is committed as it happens, which makes the frontier the
+    checkpoint a crashed crawl is resumed from.
+
+    Work is handed out as leases. A process leases whole domains, so one domain is
+    only ever crawled by one process and its politeness rules hold across processes,
+    and then leases URLs of its domains. Leases are renewed in the background and
+    expire when a process dies, after which the work goes back to the queue.
+    """
+
+    def __init__(self, path=FRONTIER_CONFIG["path"], max_depth=CRAWL_MAX_DEPTH,
+                 max_pages_per_domain=CRAWL_MAX_PAGES_PER_DOMAIN, same_site_only=CRAWL_SAME_SITE_ONLY,
+                 max_attempts=CRAWL_MAX_ATTEMPTS, lease_timeout=FRONTIER_CONFIG["lease_timeout"],
+                 max_leased_domains=None):
+        self.path = path
+        self.max_depth = max_depth
+        self.max_pages_per_domain = max_pages_per_domain
+        self.same_site_only = same_site_only
+        self.max_attempts = max_attempts
+        self.lease_timeout = lease_timeout
+        # Domains one process may hold at a time, None for no limit
+        self.max_leased_domains = max_leased_domains
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.run_id = None
+
+        self._lock = threading.Lock()
+        self._sites = set()
+        self._full_domains = set()
+        self._unsaved = 0
+        self._initialize()
+
+        self._stopped = threading.Event()
+        self._renewer = threading.Thread(target=self._renew_loop, name="frontier-leases", daemon=True)
+        self._renewer.start()
+
+    def _initialize(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Other processes may hold the write lock for a moment
+        self.connection = sqlite3.connect(self.path, timeout=FRONTIER_CONFIG["busy_timeout"],
+                                          check_same_thread=False)
+        self.connection.execute(f"PRAGMA journal_mode={FRONTIER_CONFIG['journal_mode']}")
+        has_domains = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'frontier_domains'").fetchone()
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT PRIMARY KEY,
+                domain TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                priority REAL NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                added DATETIME DEFAULT CURRENT_TIMESTAMP,
+                run_id INTEGER,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_frontier_state_priority
+                ON frontier (state, priority);
+
+            -- Per-domain page count and the process currently crawling the domain
+            CREATE TABLE IF NOT EXISTS frontier_domains (
+                domain TEXT PRIMARY KEY,
+                pages INTEGER NOT NULL DEFAULT 0,
+                owner TEXT,
+                lease_expires REAL
+            );
+
+            CREATE TABLE IF NOT EXISTS frontier_sites (
+                site TEXT PRIMARY KEY
+            );
+
+            CREATE TABLE IF NOT EXISTS frontier_meta (
+                key TEXT PRIMARY KEY,
+                value BLOB
+            );
+
+            CREATE TABLE IF NOT EXISTS crawl_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                status TEXT NOT NULL DEFAULT 'running',
+                started DATETIME DEFAULT CURRENT_TIMESTAMP,
+                finished DATETIME,
+                resumes INTEGER NOT NULL DEFAULT 0
+            );
+        ''')
+        # Frontiers written by older versions lack the checkpoint and lease columns
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(frontier)")}
+        for name, column_type in (("run_id", "INTEGER"), ("attempts", "INTEGER NOT NULL DEFAULT 0"),
+                                  ("lease_owner", "TEXT"), ("lease_expires", "REAL")):
+            if name not in columns:
+                self.connection.execute(f"ALTER TABLE frontier ADD COLUMN {name} {column_type}")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_frontier_domain_state ON frontier (domain, state)")
+        if not has_domains:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO frontier_domains (domain, pages) SELECT domain, COUNT(*) FROM frontier GROUP BY domain")
+        self.connection.commit()
+
+        self._sites = {row[0] for row in self.connection.execute("SELECT site FROM frontier_sites")}
+        self.bloom = self._load_bloom()
+
+    def _load_bloom(self):
+        capacity = FRONTIER_CONFIG["bloom_capacity"]
+        error_rate = FRONTIER_CONFIG["bloom_error_rate"]
+        row = self.connection.execute("SELECT value FROM frontier_meta WHERE key = 'bloom'").fetchone()
+        bloom = BloomFilter.from_bytes(row[0], capacity, error_rate) if row else None
+        if bloom is None:
+            bloom = BloomFilter(capacity, error_rate)
+            # Rebuild from the queue itself when there is no usable saved filter
+            for (url,) in self.connection.execute("SELECT url FROM frontier"):
+                bloom.add(url)
+        return bloom
+
+    def reset(self):
+        """Drops all queued and seen URLs to start a fresh crawl"""
+        with self._lock:
+            self._clear()
+            self.connection.commit()
+
+    def start_run(self):
+        """Clears the frontier and records a new crawl run; returns its ID"""
+        with self._lock:
+            self._clear()
+            self._new_run()
+            self.connection.commit()
+        logging.info(f"Started crawl run {self.run_id}")
+        return self.run_id
+
+    def _clear(self):
+        """Caller holds the lock and commits"""
+        for table in ("frontier", "frontier_domains", "frontier_sites", "frontier_meta"):
+            self.connection.execute(f"DELETE FROM {table}")
+        self._sites.clear()
+        self._full_domains.clear()
+        self.bloom = BloomFilter(FRONTIER_CONFIG["bloom_capacity"], FRONTIER_CONFIG["bloom_error_rate"])
+
+    def _new_run(self):
+        """Caller holds the lock and commits"""
+        self.run_id = self.connection.execute("INSERT INTO crawl_runs DEFAULT VALUES").lastrowid
+
+    def resume_run(self):
+        """
+        Picks up the latest run that did not complete. URLs that were in flight when it
+        stopped go back to pending, as do failed URLs with attempts left.
+        Returns the run ID, or None if there is nothing to resume.
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT id FROM crawl_runs WHERE status != 'completed' ORDER BY id DESC LIMIT 1").fetchone()
+            if not row:
+                return None
+            self.run_id = row[0]
+            in_flight = self.connection.execute(
+                """UPDATE frontier SET state = 'pending', lease_owner = NULL, lease_expires = NULL 
+                WHERE state = 'in_flight'""").rowcount
+            self.connection.execute("UPDATE frontier_domains SET owner = NULL, lease_expires = NULL")
+            retried = self.connection.execute(
+                "UPDATE frontier SET state = 'pending' WHERE state = 'failed' AND attempts < ?",
+                (self.max_attempts,)
+            ).rowcount
+            self.connection.execute(
+                "UPDATE crawl_runs SET status = 'running', resumes = resumes + 1 WHERE id = ?", (self.run_id,))
+            self.connection.commit()
+        counts = self.state_counts()
+        logging.info(
+            f"Resuming crawl run {self.run_id}: {counts.get('done', 0)} done, "
+            f"{counts.get('pending', 0)} pending ({in_flight} were in flight, {retried} failed URLs retried)"
+        )
+        return self.run_id
+
+    def attach_run(self, seeds):
+        """
+        Used by worker processes: joins the latest run that has not completed, or starts
+        a new one from the seeds if there is none. Unlike resume_run() it leaves URLs
+        leased by live processes alone. Returns the run ID.
+        """
+        with self._lock:
+            # The check and the new run happen in one write transaction, so hosts
+            # starting at the same time agree on a single run
+            self.connection.execute("BEGIN IMMEDIATE")
+            row = self.connection.execute(
+                "SELECT id FROM crawl_runs WHERE status != 'completed' ORDER BY id DESC LIMIT 1").fetchone()
+            if row:
+                self.run_id = row[0]
+                self.connection.execute(
+                    """UPDATE frontier SET state = 'pending' 
+                    WHERE (state = 'in_flight' AND lease_owner IS NULL) OR (state = 'failed' AND attempts < ?)""",
+                    (self.max_attempts,))
+                self.connection.execute(
+                    "UPDATE crawl_runs SET status = 'running', resumes = resumes + 1 WHERE id = ? AND status != 'running'",
+                    (self.run_id,))
+                self.connection.commit()
+                logging.info(f"Joined crawl run {self.run_id}")
+                return self.run_id
+            self._clear()
+            self._new_run()
+            self.connection.commit()
+        logging.info(f"Started crawl run {self.run_id}")
+        self.add_seeds(seeds)
+        return self.run_id
+
+    def join_run(self):
+        """Picks up the run a worker process was started for; returns its ID or None"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT id FROM crawl_runs WHERE status = 'running' ORDER BY id DESC LIMIT 1").fetchone()
+        self.run_id = row[0] if row else None
+        return self.run_id
+
+    def end_run(self, status):
+        """Records how the current run ended ('completed' or 'interrupted')"""
+        if self.run_id is None:
+            return
+        with self._lock:
+            self.connection.execute(
+                "UPDATE crawl_runs SET status = ?, finished = CURRENT_TIMESTAMP WHERE id = ?",
+                (status, self.run_id)
+            )
+            self.connection.commit()
+        logging.info(f"Crawl run {self.run_id} {status}")
+
+    def add_seeds(self, urls):
+        """Queues the start URLs; their sites define what counts as same-site"""
+        with self._lock:
+            for url in urls:
+                site = self._site(urlparse(url).hostname or "")
+                if site not in self._sites:
+                    self._sites.add(site)
+                    self.connection.execute("INSERT OR IGNORE INTO frontier_sites (site) VALUES (?)", (site,))
+            added = sum(self._admit(url, depth=0) for url in urls)
+            self.connection.commit()
+        return added
+
+    def add_links(self, links, depth):
+        """Queues links discovered on a page at the given depth"""
+        if depth > self.max_depth:
+            return 0
+        with self._lock:
+            added = sum(self._admit(url, depth) for url in links)
+            self.connection.commit()
+            self._maybe_save_bloom()
+        return added
+
+    def pop(self, limit, skip_domains=()):
+        """
+        Leases up to `limit` of the highest-priority pending URLs, at most one per domain
+        per call so a large site cannot crowd the others out of the next batch.
+        Only URLs of domains this process holds, or can take over, are considered.
+        """
+        now = time.time()
+        expires = now + self.lease_timeout
+        with self._lock:
+            # Concurrent pops from other processes wait here instead of leasing the same rows
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._reclaim_expired(now)
+                owned = {row[0] for row in self.connection.execute(
+                    "SELECT domain FROM frontier_domains WHERE owner = ?", (self.worker_id,))}
+                rows = self.connection.execute(
+                    """SELECT frontier.url, frontier.domain FROM frontier 
+                    JOIN frontier_domains AS d ON d.domain = frontier.domain 
+                    WHERE frontier.state = 'pending' AND (d.owner IS NULL OR d.owner = ? OR d.lease_expires < ?) 
+                    ORDER BY frontier.priority, frontier.rowid LIMIT ?""",
+                    (self.worker_id, now, limit * 10)
+                ).fetchall()
+
+                urls = []
+                taken = set(skip_domains)
+                for url, domain in rows:
+                    if domain in taken:
+                        continue
+                    if domain not in owned:
+                        if self.max_leased_domains is not None and len(owned) >= self.max_leased_domains:
+                            continue
+                        owned.add(domain)
+                    taken.add(domain)
+                    urls.append((url, domain))
+                    if len(urls) >= limit:
+                        break
+
+                self.connection.executemany(
+                    "UPDATE frontier_domains SET owner = ?, lease_expires = ? WHERE domain = ?",
+                    [(self.worker_id, expires, domain) for domain in {domain for _, domain in urls}]
+                )
+                self.connection.executemany(
+                    """UPDATE frontier SET state = 'in_flight', attempts = attempts + 1, 
+                    lease_owner = ?, lease_expires = ? WHERE url = ?""",
+                    [(self.worker_id, expires, url) for url, _ in urls]
+                )
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+        return [url for url, _ in urls]
+
+    def finish(self, url, state="done"):
+        """Marks a leased URL as done (or failed) and releases its lease"""
+        with self._lock:
+            cursor = self.connection.execute(
+                """UPDATE frontier SET state = ?, lease_owner = NULL, lease_expires = NULL 
+                WHERE url = ? AND (lease_owner = ? OR lease_owner IS NULL)""",
+                (state, url, self.worker_id)
+            )
+            self.connection.commit()
+        if not cursor.rowcount:
+            logging.warning(f"Lease on {url} expired and was taken over by another worker")
+
+    def exhausted(self):
+        """True when no URL is pending or leased by any process, so nothing can add more work"""
+        with self._lock:
+            return self.connection.execute(
+                "SELECT 1 FROM frontier WHERE state IN ('pending', 'in_flight') LIMIT 1").fetchone() is None
+
+    def release(self):
+        """Hands this process's leased URLs and domains back to the queue, e.g. on shutdown"""
+        with self._lock:
+            released = self.connection.execute(
+                """UPDATE frontier SET state = 'pending', attempts = attempts - 1, 
+                lease_owner = NULL, lease_expires = NULL WHERE lease_owner = ? AND state = 'in_flight'""",
+                (self.worker_id,)
+            ).rowcount
+            self.connection.execute(
+                "UPDATE frontier_domains SET owner = NULL, lease_expires = NULL WHERE owner = ?", (self.worker_id,))
+            self.connection.commit()
+        if released:
+            logging.info(f"Released {released} leased URLs back to the queue")
+
+    def depth(self, url):
+        with self._lock:
+            row = self.connection.execute("SELECT depth FROM frontier WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else 0
+
+    def pending_count(self):
+        with self._lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM frontier WHERE state = 'pending'").fetchone()[0]
+
+    def state_counts(self):
+        """Number of URLs in each state"""
+        with self._lock:
+            return dict(self.connection.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state"))
+
+    def close(self):
+        if self.connection:
+            self.release()
+        self._stopped.set()
+        self._renewer.join()
+        with self._lock:
+            if self.connection:
+                self._save_bloom()
+                self.connection.close()
+                self.connection = None
+                logging.info("Frontier closed")
+
+    def _admit(self, url, depth):
+        """Applies scope, depth, per-domain and dedup rules. Caller holds the lock."""
+        url = urldefrag(url)[0]
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            return False
+        if depth > self.max_depth:
+            return False
+        if self.same_site_only and depth > 0 and not any(
+                domain_matches(parsed.hostname, site) for site in self._sites):
+            return False
+
+        domain = parsed.netloc
+        if domain in self._full_domains:
+            return False
+        # The Bloom filter only knows this process's URLs; the primary key catches the rest
+        if not self.bloom.add(url):
+            return False
+
+        # The page count is shared with other processes, so it is claimed in the database
+        self.connection.execute("INSERT OR IGNORE INTO frontier_domains (domain) VALUES (?)", (domain,))
+        if not self.connection.execute(
+                "UPDATE frontier_domains SET pages = pages + 1 WHERE domain = ? AND pages < ?",
+                (domain, self.max_pages_per_domain)).rowcount:
+            self._full_domains.add(domain)
+            return False
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO frontier (url, domain, depth, priority, run_id) VALUES (?, ?, ?, ?, ?)",
+            (url, domain, depth, depth, self.run_id)
+        )
+        if not cursor.rowcount:
+            self.connection.execute("UPDATE frontier_domains SET pages = pages - 1 WHERE domain = ?", (domain,))
+            return False
+        self._unsaved += 1
+        return True
+
+    def _reclaim_expired(self, now):
+        """Puts URLs of processes whose leases ran out back in the queue. Caller holds the lock."""
+        reclaimed = self.connection.execute(
+            """UPDATE frontier SET state = 'pending', lease_owner = NULL, lease_expires = NULL 
+            WHERE state = 'in_flight' AND lease_expires < ?""", (now,)
+        ).rowcount
+        if reclaimed:
+            logging.warning(f"Reclaimed {reclaimed} URLs whose leases expired")
+        # Domains this process has run out of work for become free for others
+        self.connection.execute(
+            """UPDATE frontier_domains SET owner = NULL, lease_expires = NULL WHERE owner = ? AND NOT EXISTS 
+            (SELECT 1 FROM frontier WHERE frontier.domain = frontier_domains.domain 
+            AND frontier.state IN ('pending', 'in_flight'))""", (self.worker_id,)
+        )
+
+    def _renew_loop(self):
+        """Extends this process's leases well before they expire"""
+        while not self._stopped.wait(self.lease_timeout / 3):
+            expires = time.time() + self.lease_timeout
+            with self._lock:
+                try:
+                    self.connection.execute(
+                        "UPDATE frontier SET lease_expires = ? WHERE lease_owner = ? AND state = 'in_flight'",
+                        (expires, self.worker_id))
+                    self.connection.execute(
+                        "UPDATE frontier_domains SET lease_expires = ? WHERE owner = ?", (expires, self.worker_id))
+                    self.connection.commit()
+                except sqlite3.Error as e:
+                    logging.warning(f"Could not renew frontier leases: {e}")
+                    self.connection.rollback()
+
+    def _maybe_save_bloom(self):
+        if self._unsaved >= FRONTIER_CONFIG["bloom_save_interval"]:
+            self._save_bloom()
+
+    def _save_bloom(self):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO frontier_meta (key, value) VALUES ('bloom', ?)",
+            (self.bloom.to_bytes(),)
+        )
+        self.connection.commit()
+        self._unsaved = 0
+
+    @staticmethod
+    def _site(host):
+        return host[4:] if host.startswith("www.") else host
@@ -0,0 +1,102 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import logging
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from config import REQUEST_TIMEOUT, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, MAX_PAGE_BYTES
+
+# Responses that mean the proxy was refused or blocked rather than the page failing
+PROXY_BLOCK_STATUSES = (403, 407, 429)
+
+class HttpFetcher:
+    """Plain HTTP client with pooled keep-alive connections, routed through the proxy rotator"""
+
+    def __init__(self, user_agent_manager, proxy_rotator=None):
+        self.user_agent_manager = user_agent_manager
+        self.proxy_rotator = proxy_rotator
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+
+    def fetch(self, url, headers=None):
+        """
+        Fetches a URL without rendering it, through a proxy picked per request
+        if there are any. The outcome is reported to the proxy's health record.
+        Returns a response dict, or None if the request itself failed.
+        """
+        request_headers = {"User-Agent": self.user_agent_manager.get_user_agent()}
+        if headers:
+            request_headers.update(headers)
+        proxy = self.proxy_rotator.get_proxy() if self.proxy_rotator else None
+        proxies = {"http": proxy, "https": proxy} if proxy else None
+
+        started = time.monotonic()
+        try:
+            with self.session.get(url, headers=request_headers, timeout=REQUEST_TIMEOUT, stream=True,
+                                  proxies=proxies) as response:
+                body, truncated = self._read_body(response)
+                self._report_proxy(proxy, response.status_code not in PROXY_BLOCK_STATUSES,
+                                   time.monotonic() - started)
+                if truncated:
+                    logging.warning(f"Truncated {url} at {MAX_PAGE_BYTES} bytes")
+                return {
+                    "url": response.url,
+                    "status_code": response.status_code,
+                    "content": self._decode(response, body),
+                    "headers": response.headers,
+                    "fetched_with": "http",
+                    "truncated": truncated,
+                }
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"HTTP fetch failed for {url}{f' via {proxy}' if proxy else ''}: {e}")
+            self._report_proxy(proxy, False)
+            return None
+
+    def _report_proxy(self, proxy, success, latency=None):
+        if proxy:
+            self.proxy_rotator.report(proxy, success, latency)
+
+    @staticmethod
+    def _read_body(response):
+        """Reads the body up to MAX_PAGE_BYTES; returns it and whether it was cut off"""
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            if size + len(chunk) > MAX_PAGE_BYTES:
+                chunks.append(chunk[:MAX_PAGE_BYTES - size])
+                return b"".join(chunks), True
+            chunks.append(chunk)
+            size += len(chunk)
+        return b"".join(chunks), False
+
+    @staticmethod
+    def _decode(response, body):
+        """Decodes like response.text, which is not available once the body was streamed"""
+        encoding = response.encoding
+        if encoding is None:
+            encoding = (chardet.detect(body)["encoding"] if chardet else None) or "utf-8"
+        try:
+            return str(body, encoding, errors="replace")
+        except LookupError:
+            return str(body, errors="replace")
+
+    def close(self):
+        self.session.close()
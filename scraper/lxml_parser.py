@@ -0,0 +1,187 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import logging
+from urllib.parse import urlparse, urljoin
+import lxml.html
+from lxml.cssselect import CSSSelector
+from .extraction import ExtractionRegistry, GENERIC_EXTRACTOR, GENERIC_PARSER_VERSION
+
+# Strings inside these tags are left out of BeautifulSoup's get_text(), so they are skipped here too
+STRING_CONTAINERS = {'script', 'style', 'template', 'rt', 'rp'}
+
+GENERIC_REMOVED_TAGS = ('script', 'style', 'header', 'footer', 'nav', 'aside')
+GENERIC_EXCLUDED = STRING_CONTAINERS | set(GENERIC_REMOVED_TAGS)
+
+def _css(selector):
+    return CSSSelector(selector, translator='html')
+
+
+def _iter_strings(element, excluded=STRING_CONTAINERS):
+    """
+    Yields the text nodes under element in document order, like BeautifulSoup does.
+    Descendants with an excluded tag only contribute the text that follows them.
+    """
+    if element.text:
+        yield element.text
+    # Iterative walk, deep DOMs would overflow a recursive one
+    stack = [(iter(element), None)]
+    while stack:
+        children, tail = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            if tail:
+                yield tail
+            continue
+        if isinstance(child.tag, str) and child.tag not in excluded:
+            if child.text:
+                yield child.text
+            stack.append((iter(child), child.tail))
+        elif child.tail:
+            # Comments, processing instructions and scripts only contribute their tail
+            yield child.tail
+
+def _text(element, separator='', excluded=STRING_CONTAINERS):
+    """Equivalent of BeautifulSoup's get_text(separator, strip=True)"""
+    return separator.join(s for s in (s.strip() for s in _iter_strings(element, excluded)) if s)
+
+def _string(element):
+    """Equivalent of BeautifulSoup's .string"""
+    if len(element) == 0:
+        return element.text
+    if len(element) == 1 and not element.text and not element[0].tail:
+        return _string(element[0])
+    return None
+
+def _find(root, tag, **attributes):
+    for element in root.iter(tag):
+        if all(_attribute_matches(element, name, value) for name, value in attributes.items()):
+            return element
+    return None
+
+def _attribute_matches(element, name, value):
+    actual = element.get(name)
+    if actual is None:
+        return False
+    if name == 'class':
+        return value in actual.split() or actual == value
+    return actual == value
+
+
+# Domain rules with their selectors compiled once, at import
+RULES = ExtractionRegistry(_css, _text)
+
+
+class LxmlParser:
+    """
+    Parser backend that works on the lxml tree directly instead of through BeautifulSoup.
+    Produces the same output as Parser, at a fraction of the allocation and traversal cost.
+    """
+
+    def parse(self, html_content, url):
+        """Parse content from any website"""
+        if not html_content:
+            logging.error(f"Parser received no HTML content for URL: {url}")
+            return None
+
+        try:
+            # Parse bytes so pages with an XML encoding declaration are accepted
+            document = lxml.html.document_fromstring(
+                html_content.encode('utf-8'),
+                parser=lxml.html.HTMLParser(encoding='utf-8')
+            )
+            domain = urlparse(url).netloc
+            rule = RULES.resolve(url)
+
+            # Extract title
+            title_elem = next(document.iter('title'), None)
+            # An empty <title> has no string, as in BeautifulSoup
+            title = (_string(title_elem) or "").strip() if title_elem is not None else ""
+
+            # Records are extracted once; they feed both the content summary and the stored rows
+            records = rule.extract_records(document) if rule else []
+
+            # Extract main content text
+            content = self._extract_main_content(document, rule, records)
+
+            # Extract all links and make them absolute
+            links = self._extract_links(document, url)
+
+            movies, stored_records = rule.stored_records(records) if rule else ([], {})
+            return {
+                "domain": domain,
+                "title": title,
+                "content": content,
+                "links": links,
+                "movies": movies,  # Only populated for IMDb top chart
+                "records": stored_records,
+                "extractor": rule.name if rule else GENERIC_EXTRACTOR,
+                "parser_version": rule.version if rule else GENERIC_PARSER_VERSION
+            }
+        except Exception as e:
+            logging.error(f"Error parsing content from {url}: {e}", exc_info=True)
+            return None
+
+    def _extract_main_content(self, document, rule, records):
+        """Content lines of the page's extraction rule, or the generic main content"""
+        if rule:
+            try:
+                lines = rule.content_lines(document, records)
+                if lines:
+                    return "\n".join(lines)
+            except Exception as e:
+                logging.error(f"Content extraction of the {rule.name} rule failed: {e}")
+
+        return self._extract_generic_content(document)
+
+    def _extract_generic_content(self, document):
+        """For general sites"""
+        try:
+            content_containers = [
+                _find(document, 'main'),
+                _find(document, 'article'),
+                _find(document, 'div', **{'class': 'content'}),
+                _find(document, 'div', **{'class': 'main-content'}),
+                _find(document, 'div', id='content'),
+                _find(document, 'body')  # Fallback to entire body
+            ]
+
+            container = next((c for c in content_containers if c is not None), None)
+
+            if container is not None:
+                # Text is read first because removing an element merges its tail into
+                # the preceding string, which BeautifulSoup keeps separate
+                text = _text(container, separator=' ', excluded=GENERIC_EXCLUDED)
+
+                # Clean up by removing unwanted elements, so their links are skipped too
+                for element in list(container.iter(*GENERIC_REMOVED_TAGS)):
+                    if element is not container:
+                        element.drop_tree()
+
+                return text
+            return ""
+        except Exception:
+            return ""
+
+    def _extract_links(self, document, base_url):
+        """Extract all links and convert to absolute URLs"""
+        links = set()
+        for link in document.iter('a'):
+            href = link.get('href')
+            if href is None:
+                continue
+            href = href.strip()
+            if href and not href.startswith(('javascript:', 'mailto:', 'tel:')):
+                absolute_url = urljoin(base_url, href)
+                # Filter out non-HTTP links and common tracking links
+                if absolute_url.startswith('http') and not any(x in absolute_url for x in ['/ad/', '/track/', '/click?']):
+                    links.add(absolute_url)
+        return list(links)
@@ -0,0 +1,161 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import logging
+import multiprocessing
+import multiprocessing.util
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import PARSER_WORKERS, PARSER_MAX_IN_FLIGHT, METRICS_CONFIG
+from utils.metrics import metrics
+
+# One parser per worker process, created by the pool initializer
+_worker_parser = None
+
+def _init_worker():
+    global _worker_parser
+    # Imported here so the parent process never loads the parser libraries it does not use
+    from .parser import create_parser
+    _worker_parser = create_parser()
+    if "parse" in metrics.profile_stages:
+        # Worker processes skip atexit handlers, multiprocessing finalizers still run
+        multiprocessing.util.Finalize(None, metrics.dump_profiles,
+                                      args=(METRICS_CONFIG["profile_dir"],), exitpriority=10)
+
+def _parse(html_content, url):
+    """Returns the parse result and the seconds the parser spent on it"""
+    started = time.perf_counter()
+    with metrics.profiled("parse"):
+        result = _worker_parser.parse(html_content, url)
+    return result, time.perf_counter() - started
+
+
+class ParserPool:
+    """
+    Parsing stage of the crawl pipeline.
+    Pages are parsed in worker processes so parsing scales with cores instead of
+    competing with the fetch threads for the GIL. At most max_in_flight pages wait
+    for a parser; submit() blocks beyond that, which slows fetching down to parse speed.
+    A worker that dies (an OOM on a huge page, say) breaks the whole executor; it is
+    replaced and the pages it was parsing are submitted once more.
+    """
+
+    def __init__(self, workers=PARSER_WORKERS, max_in_flight=PARSER_MAX_IN_FLIGHT):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._pending = 0
+        self._idle = threading.Condition()
+
+        self._executor_lock = threading.Lock()
+
+        if workers > 0:
+            self._executor = self._create_executor()
+            self._parser = None
+        else:
+            from .parser import create_parser
+            self._executor = None
+            self._parser = create_parser()
+
+    def submit(self, html_content, url, callback):
+        """
+        Parses a page and calls callback(result, parse_seconds) on a pool thread
+        once the page is parsed; result is None on failure.
+        """
+        self._slots.acquire()
+        with self._idle:
+            self._pending += 1
+
+        if self._executor is None:
+            started = time.perf_counter()
+            with metrics.profiled("parse"):
+                result = self._parser.parse(html_content, url)
+            self._finish(url, callback, (result, time.perf_counter() - started))
+            return
+
+        self._submit(html_content, url, callback)
+
+    def _create_executor(self):
+        # Forking a process that already runs threads is unsafe, so workers start clean
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_init_worker)
+
+    def _submit(self, html_content, url, callback, retried=False):
+        with self._executor_lock:
+            executor = self._executor
+        try:
+            future = executor.submit(_parse, html_content, url)
+        except BrokenProcessPool as e:
+            self._retry(executor, html_content, url, callback, retried, e)
+            return
+        except Exception as e:
+            logging.error(f"Could not submit {url} to the parser pool: {e}")
+            self._finish(url, callback, (None, 0.0))
+            return
+        future.add_done_callback(
+            lambda f: self._on_done(f, executor, html_content, url, callback, retried))
+
+    def _retry(self, executor, html_content, url, callback, retried, error):
+        """Replaces a broken executor and submits the page again, once"""
+        self._replace_executor(executor)
+        if retried:
+            logging.error(f"Parser worker failed on {url} again, giving up: {error}")
+            self._finish(url, callback, (None, 0.0))
+            return
+        logging.warning(f"Parser pool broke while parsing {url}, submitting it again")
+        self._submit(html_content, url, callback, retried=True)
+
+    def _replace_executor(self, broken):
+        # Every page in flight sees the same broken executor; only the first replaces it
+        with self._executor_lock:
+            if self._executor is not broken:
+                return
+            logging.error("A parser worker died, restarting the parser pool")
+            metrics.inc("parser_pool_restarts_total")
+            self._executor = self._create_executor()
+        broken.shutdown(wait=False)
+
+    def is_idle(self):
+        """True when no submitted page is still waiting for its callback"""
+        with self._idle:
+            return self._pending == 0
+
+    def wait_idle(self):
+        with self._idle:
+            self._idle.wait_for(lambda: self._pending == 0)
+
+    def close(self):
+        self.wait_idle()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def _on_done(self, future, executor, html_content, url, callback, retried):
+        try:
+            result = future.result()
+        except BrokenProcessPool as e:
+            self._retry(executor, html_content, url, callback, retried, e)
+            return
+        except Exception as e:
+            logging.error(f"Parser worker failed on {url}: {e}")
+            result = (None, 0.0)
+        self._finish(url, callback, result)
+
+    def _finish(self, url, callback, outcome):
+        try:
+            callback(*outcome)
+        except Exception as e:
+            logging.error(f"Error handling parsed content from {url}: {e}", exc_info=True)
+        finally:
+            self._slots.release()
+            with self._idle:
+                self._pending -= 1
+                self._idle.notify_all()
@@ -0,0 +1,137 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from config import RATE_CONTROL_CONFIG
+
+# Responses that mean the server wants us to slow down
+THROTTLE_STATUSES = {429, 502, 503, 504}
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class _DomainState:
+    def __init__(self, delay, retry_tokens):
+        self.delay = delay
+        self.blocked_until = 0.0
+        self.latency = None
+        self.retry_tokens = retry_tokens
+
+
+class RateController:
+    """
+    Per-domain AIMD request pacing driven by how each server responds.
+    Healthy responses add a fixed amount to a domain's request rate; throttling
+    signals (429/5xx, timeouts, slow or tiny responses) halve it, and Retry-After
+    blocks the domain outright. Retries draw on a per-domain budget that healthy
+    responses refill, so all workers together cannot hammer a struggling host.
+    """
+
+    def __init__(self, config=RATE_CONTROL_CONFIG):
+        self.initial_delay = config["initial_delay"]
+        self.min_delay = config["min_delay"]
+        self.max_delay = config["max_delay"]
+        self.backoff_delay = config["backoff_delay"]
+        self.increase_step = config["increase_step"]
+        self.decrease_factor = config["decrease_factor"]
+        self.slow_response = config["slow_response"]
+        self.min_content_length = config["min_content_length"]
+        self.jitter = config["jitter"]
+        self.max_retry_after = config["max_retry_after"]
+        self.retry_ratio = config["retry_ratio"]
+        self.retry_max_tokens = config["retry_max_tokens"]
+
+        self._domains = {}
+        self._lock = threading.Lock()
+
+    def _state(self, domain):
+        """Caller holds the lock"""
+        state = self._domains.get(domain)
+        if state is None:
+            state = self._domains[domain] = _DomainState(self.initial_delay, self.retry_max_tokens)
+        return state
+
+    def record(self, domain, status_code=None, elapsed=None, size=None, retry_after=None, failed=False):
+        """
+        Feeds the outcome of one request back into the domain's rate.
+        Statuses that say nothing about load (404 and the like) leave the rate alone.
+        """
+        with self._lock:
+            state = self._state(domain)
+            if elapsed is not None:
+                state.latency = elapsed if state.latency is None else 0.8 * state.latency + 0.2 * elapsed
+
+            wait = parse_retry_after(retry_after)
+            if wait is not None:
+                state.blocked_until = max(state.blocked_until, time.monotonic() + min(wait, self.max_retry_after))
+
+            reason = None
+            if failed:
+                reason = "request failed"
+            elif status_code in THROTTLE_STATUSES:
+                reason = f"status {status_code}"
+            elif elapsed is not None and elapsed > self.slow_response:
+                reason = f"slow response ({elapsed:.1f}s)"
+            elif size is not None and size < self.min_content_length:
+                reason = f"tiny page ({size} bytes)"
+
+            if reason:
+                # Multiplicative decrease of the rate is a multiplicative increase of the delay
+                state.delay = min(self.max_delay, max(state.delay / self.decrease_factor, self.backoff_delay))
+                logging.info(f"Slowing down {domain} to one request per {state.delay:.2f}s: {reason}")
+            elif status_code is None or status_code < 400:
+                # Additive increase of the rate
+                state.delay = max(self.min_delay, 1 / (1 / state.delay + self.increase_step)) if state.delay else 0.0
+                state.retry_tokens = min(self.retry_max_tokens, state.retry_tokens + self.retry_ratio)
+
+    def next_delay(self, domain):
+        """Delay before the next request to the domain, randomized to avoid a fixed pattern"""
+        with self._lock:
+            delay = self._state(domain).delay
+        # CLAIM: Heuristic Behavior (Randomized delays)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def blocked_until(self, domain):
+        """Monotonic time before which Retry-After forbids requests to the domain"""
+        with self._lock:
+            return self._state(domain).blocked_until
+
+    def wait_time(self, domain):
+        """How long a retry has to wait: the current delay, or longer if Retry-After says so"""
+        return max(self.next_delay(domain), self.blocked_until(domain) - time.monotonic())
+
+    def try_retry(self, domain):
+        """Takes one retry from the domain's shared budget; False once it is spent"""
+        with self._lock:
+            state = self._state(domain)
+            if state.retry_tokens < 1:
+                logging.warning(f"Retry budget for {domain} is spent, not retrying")
+                return False
+            state.retry_tokens -= 1
+            return True
+
+    def latency(self, domain):
+        """Smoothed response time of the domain, or None before the first response"""
+        with self._lock:
+            return self._state(domain).latency
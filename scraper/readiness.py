@@ -0,0 +1,151 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import json
+import logging
+import time
+from selenium.common.exceptions import TimeoutException
+from config import SELENIUM_WAIT_TIMEOUT, READINESS_CONFIG, READINESS_RULES
+from utils.domains import lookup_domain_setting
+
+# Installs a MutationObserver on first call; returns seconds since the DOM last changed
+DOM_QUIET_JS = """
+if (!window.__scraperMutations) {
+    window.__scraperMutations = {last: performance.now()};
+    new MutationObserver(function () { window.__scraperMutations.last = performance.now(); })
+        .observe(document, {childList: true, subtree: true, characterData: true});
+}
+return (performance.now() - window.__scraperMutations.last) / 1000;
+"""
+
+PAGE_HEIGHT_JS = "return [document.documentElement.scrollHeight, window.scrollY + window.innerHeight];"
+
+def readiness_settings(host):
+    """READINESS_CONFIG with the overrides of the host's READINESS_RULES entry"""
+    return {**READINESS_CONFIG, **lookup_domain_setting(host, READINESS_RULES, {})}
+
+
+class NetworkMonitor:
+    """
+    Follows one page load through the driver's performance log: requests still
+    in flight, requests dropped by resource blocking and bytes received.
+    Without a performance log the network always counts as idle.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.available = True
+        self.pending = set()
+        self.blocked = 0
+        self.received = 0
+        self.last_activity = time.monotonic()
+        # Drop the events of earlier pages
+        self._entries()
+
+    def _entries(self):
+        try:
+            return self.driver.get_log("performance")
+        except Exception as e:
+            if self.available:
+                logging.debug(f"Performance log unavailable: {e}")
+            self.available = False
+            return []
+
+    def _read(self):
+        for entry in self._entries():
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                self.pending.add(request_id)
+            elif method == "Network.loadingFinished":
+                self.pending.discard(request_id)
+                self.received += int(params.get("encodedDataLength") or 0)
+            elif method == "Network.loadingFailed":
+                self.pending.discard(request_id)
+                if params.get("blockedReason"):
+                    self.blocked += 1
+            else:
+                continue
+            self.last_activity = time.monotonic()
+
+    def idle_for(self, max_inflight):
+        """Seconds the network has been quiet with at most max_inflight requests open"""
+        self._read()
+        if not self.available:
+            return float("inf")
+        if len(self.pending) > max_inflight:
+            return 0.0
+        return time.monotonic() - self.last_activity
+
+    def stats(self):
+        """Blocked requests and received bytes of the page load so far"""
+        self._read()
+        if not self.available:
+            return {"blocked_requests": None, "transferred_bytes": None}
+        if self.blocked:
+            logging.info(f"Blocked {self.blocked} resource requests")
+        return {"blocked_requests": self.blocked, "transferred_bytes": self.received}
+
+
+def wait_until_ready(driver, host, monitor, timeout=SELENIUM_WAIT_TIMEOUT):
+    """
+    Waits until a navigated page has rendered: the body and the domain's selector
+    are present and the DOM and network have been quiet for a moment. Then scrolls
+    down a viewport at a time until no new content appears. All waits share the timeout.
+    Raises TimeoutException if the page has no body.
+    """
+    settings = readiness_settings(host)
+    deadline = time.monotonic() + timeout
+
+    _wait_for_selector(driver, "body", deadline)
+    selector = settings.get("selector")
+    if selector:
+        try:
+            _wait_for_selector(driver, selector, deadline)
+        except TimeoutException:
+            logging.warning(f"Readiness selector {selector!r} not found on {host}")
+
+    if not _wait_for_quiet(driver, monitor, settings, deadline):
+        logging.info(f"{host} still busy after {timeout}s, taking the page as it is")
+        return
+    _scroll_incrementally(driver, monitor, settings, deadline)
+
+def _wait_for_selector(driver, selector, deadline):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    WebDriverWait(driver, max(deadline - time.monotonic(), 0)).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+
+def _wait_for_quiet(driver, monitor, settings, deadline):
+    """Polls until neither the DOM nor the network changed for quiet_period; False on timeout"""
+    while True:
+        quiet = min(driver.execute_script(DOM_QUIET_JS), monitor.idle_for(settings["max_inflight"]))
+        if quiet >= settings["quiet_period"]:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(settings["poll_interval"])
+
+def _scroll_incrementally(driver, monitor, settings, deadline):
+    """Scrolls a viewport at a time to trigger lazy loading, stopping at a bottom that stays put"""
+    for _ in range(settings["max_scrolls"]):
+        height, bottom = driver.execute_script(PAGE_HEIGHT_JS)
+        if bottom >= height - 1 or time.monotonic() >= deadline:
+            break
+        driver.execute_script("window.scrollBy(0, window.innerHeight);")
+        _wait_for_quiet(driver, monitor, settings, min(deadline, time.monotonic() + settings["scroll_settle"]))
+    driver.execute_script("window.scrollTo(0, 0);")
@@ -0,0 +1,81 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import logging
+import threading
+import time
+from .parse_pool import ParserPool
+from .extraction import current_versions
+from utils.archive import ArchiveReader
+from utils.metrics import metrics
+from config import PARSER_WORKERS, REPARSE_CHUNK_SIZE
+
+def reparse(database, domain=None, workers=PARSER_WORKERS, chunk_size=REPARSE_CHUNK_SIZE):
+    """
+    Re-extracts stored pages from their archived raw HTML wherever the stored
+    parser_version is not the current version of the page's extractor, so only
+    the domains whose extractor changed are parsed again. Pages are parsed in the
+    parser pool and updated in place through the batched writer. Updated rows are
+    at the current version, so an interrupted reparse picks up where it stopped.
+    Returns the number of pages updated, or None if the stored pages could not be read.
+    """
+    versions = current_versions()
+    unarchived = database.count_unarchived(domain)
+    if unarchived:
+        logging.warning(f"{unarchived} stored pages have no archived copy and can only be updated by a crawl")
+
+    counts = {"updated": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def save(row, parsed_data, parse_seconds):
+        metrics.record_stage("parse", parse_seconds)
+        if not parsed_data:
+            logging.warning(f"Could not re-parse {row['url']}, keeping its stored content")
+            with lock:
+                counts["failed"] += 1
+            return
+        database.update_content(row, parsed_data["title"], parsed_data["content"], parsed_data["links"],
+                                parsed_data["movies"], parsed_data["extractor"], parsed_data["parser_version"],
+                                parsed_data["records"], parsed_data.get("truncated", False))
+        with lock:
+            counts["updated"] += 1
+
+    started = time.monotonic()
+    reader = ArchiveReader()
+    pool = ParserPool(workers)
+    last_id = 0
+    submitted = 0
+    try:
+        while True:
+            rows = database.stale_content(versions, last_id, chunk_size, domain)
+            if rows is None:
+                return None
+            if not rows:
+                break
+            for row in rows:
+                last_id = row["id"]
+                record = reader.read(row["segment"], row["offset"], row["length"])
+                if record is None:
+                    with lock:
+                        counts["failed"] += 1
+                    continue
+                # Blocks while the pool is full, so memory stays bounded by its in-flight limit
+                pool.submit(record["content"], row["url"],
+                            lambda parsed_data, parse_seconds, row=row: save(row, parsed_data, parse_seconds))
+                submitted += 1
+            logging.info(f"Submitted {submitted} stale pages for re-parsing")
+    finally:
+        pool.close()
+        reader.close()
+        database.flush()
+
+    logging.info(f"Re-parsed {counts['updated']} pages in {time.monotonic() - started:.1f}s "
+                 f"({counts['failed']} failed)")
+    return counts["updated"]
@@ -10,25 +10,62 @@ Misuse of this software may result in legal consequences. The developers assume
 """
 import logging
 import time
-import random
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import weakref
+from urllib.parse import urlparse
+import lxml.html
+from lxml import etree
+# Only the exception types are imported eagerly; the browser stack is imported on first use
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from config import MAX_RETRIES, SELENIUM_HEADLESS, SELENIUM_WAIT_TIMEOUT
+from config import (
+    MAX_RETRIES, SELENIUM_HEADLESS,
+    HTTP_FETCH_ENABLED, MIN_CONTENT_LENGTH, MAX_PAGE_BYTES, BROWSER_ONLY_DOMAINS, EXPECTED_SELECTORS,
+    BLOCKED_RESOURCE_PATTERNS, RESOURCE_BLOCKING_DEFAULT, RESOURCE_BLOCKING_PROFILES
+)
 from utils.user_agent_manager import UserAgentManager
-from .proxy_rotator import ProxyRotator  # <--- CLAIM: Proxy Rotation
+from utils.proxy_rotator import ProxyRotator  # <--- CLAIM: Proxy Rotation
+from utils.domains import get_host, domain_matches, lookup_domain_setting
+from utils.metrics import metrics
+from .http_fetcher import HttpFetcher
+from .browser_pool import BrowserPool
+from .rate_controller import RateController, THROTTLE_STATUSES
+from .readiness import NetworkMonitor, wait_until_ready
+
+# Visible body text, ignoring inline scripts and styles
+BODY_TEXT_XPATH = etree.XPath(
+    "//body//text()[not(ancestor::script) and not(ancestor::style) and not(ancestor::noscript)]"
+)
+
+def _cap_page(content):
+    """Cuts a page to MAX_PAGE_BYTES of UTF-8; returns it and whether it was cut"""
+    # A character takes at most 4 bytes, so shorter pages cannot be over the cap
+    if len(content) * 4 <= MAX_PAGE_BYTES:
+        return content, False
+    encoded = content.encode("utf-8")
+    if len(encoded) <= MAX_PAGE_BYTES:
+        return content, False
+    # A character split by the cut is dropped
+    return encoded[:MAX_PAGE_BYTES].decode("utf-8", errors="ignore"), True
 
 class RequestHandler:
     def __init__(self):
         self.user_agent_manager = UserAgentManager()
         self.proxy_rotator = ProxyRotator()
-        self.driver = self._init_selenium()
+        # Proxy each pooled driver was launched with, so fetch outcomes can be credited to it
+        self._driver_proxies = weakref.WeakKeyDictionary()
+        # Blocked URL patterns currently applied to each pooled driver
+        self._driver_blocking = weakref.WeakKeyDictionary()
+        self.http_fetcher = HttpFetcher(self.user_agent_manager, self.proxy_rotator)
+        # Shared with the scheduler, which paces domains with the same feedback
+        self.rate_controller = RateController()
+        # Chrome instances are only started once a page actually needs rendering
+        self.browser_pool = BrowserPool(self._init_selenium)
 
     def _init_selenium(self):
         """Initializes an undetected-chromedriver with Rotated IP and User-Agent"""
         try:
+            # Half a second of imports that runs without Chrome never pay for
+            import undetected_chromedriver as uc
+            
             options = uc.ChromeOptions()
             
             # CLAIM: User-Agent Rotation
@@ -53,6 +90,9 @@ class RequestHandler:
             options.add_argument("--disable-blink-features=AutomationControlled")
             options.add_argument("--disable-notifications")
             
+            # Network events in the performance log show which requests were blocked
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            
             logging.info("Initializing undetected-chromedriver...")
             driver = uc.Chrome(
                 options=options, 
@@ -66,84 +106,234 @@ class RequestHandler:
             # Stealth scripts to hide automation flags
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": user_agent})
+            driver.execute_cdp_cmd('Network.enable', {})
             
             logging.info("Undetected-chromedriver initialized successfully")
+            if proxy:
+                self._driver_proxies[driver] = proxy
             return driver
         except Exception as e:
             logging.error(f"Failed to initialize undetected-chromedriver: {e}", exc_info=True)
             return None
 
+    def warm_up(self, urls):
+        """
+        Starts the browser pool in the background if any of the URLs will need it,
+        so Chrome is ready by the time the first such page is fetched.
+        Runs that only need HTTP never launch a browser.
+        """
+        if any(self._requires_browser(get_host(url)) for url in urls) or not HTTP_FETCH_ENABLED:
+            self.browser_pool.start()
+
+    def fetch(self, url, validators=None, timings=None):
+        """
+        Fetches a page over plain HTTP first and escalates to the browser
+        when the domain or the response indicates JavaScript rendering is needed.
+        Only a 200 response is escalated: a failed, throttled or error response is
+        returned as it is, since a browser load would hit the host again at once.
+        Cached validators turn the HTTP request into a conditional one;
+        an unchanged page comes back with status_code 304 and no content.
+        Stage durations are added to the timings dict if one is given.
+        Returns a response dict, or None if every attempt failed.
+        """
+        host = get_host(url)
+        
+        if HTTP_FETCH_ENABLED and not self._requires_browser(host):
+            response = self._fetch_with_http(url, validators, timings)
+            if response and response["status_code"] == 304:
+                logging.info(f"{url} not modified since last fetch")
+                return response
+            if response is None or response["status_code"] != 200:
+                status = response["status_code"] if response else "no response"
+                logging.warning(f"HTTP fetch of {url} ended with {status}, not escalating to the browser")
+                return response
+            if not self._needs_rendering(response, host):
+                logging.info(f"Fetched {url} over HTTP ({len(response['content'])} bytes)")
+                return response
+            logging.info(f"Escalating {url} to browser rendering")
+            # The browser load is another request to the same host, so it keeps the domain's pace
+            wait = self.rate_controller.wait_time(urlparse(url).netloc)
+            if wait > 0:
+                with metrics.stage("backoff", timings):
+                    time.sleep(wait)
+        
+        return self._fetch_with_browser(url, timings)
+
+    def _fetch_with_http(self, url, validators, timings=None):
+        """Plain HTTP fetch, retried on throttling responses as the rate controller allows"""
+        domain = urlparse(url).netloc
+        headers = self._conditional_headers(validators)
+        
+        for attempt in range(MAX_RETRIES):
+            started = time.monotonic()
+            with metrics.stage("fetch", timings):
+                response = self.http_fetcher.fetch(url, headers)
+            elapsed = time.monotonic() - started
+            
+            if response is None:
+                self.rate_controller.record(domain, failed=True)
+            else:
+                self.rate_controller.record(domain, response["status_code"], elapsed,
+                                            retry_after=response["headers"].get("Retry-After"))
+                if response["status_code"] not in THROTTLE_STATUSES:
+                    return response
+            
+            if attempt == MAX_RETRIES - 1 or not self.rate_controller.try_retry(domain):
+                return response
+            wait = self.rate_controller.wait_time(domain)
+            logging.info(f"Retrying {url} in {wait:.2f}s (attempt {attempt + 2}/{MAX_RETRIES})")
+            with metrics.stage("backoff", timings):
+                time.sleep(wait)
+        return response
+
     def fetch_page(self, url):
-        """Fetches page content using Exponential Backoff"""
-        if not self.driver:
-            # Try to re-init if driver crashed previously
-            self.driver = self._init_selenium()
-            if not self.driver:
-                logging.error("Undetected-chromedriver is not available")
-                return None
+        """Fetches page content, returning the HTML or None"""
+        response = self.fetch(url)
+        return response["content"] if response else None
+
+    def _conditional_headers(self, validators):
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def _requires_browser(self, host):
+        """Per-domain rule: some sites only render their content with JavaScript"""
+        return any(domain_matches(host, domain) for domain in BROWSER_ONLY_DOMAINS)
 
-        domain = url.split('//')[-1].split('/')[0]
+    def _needs_rendering(self, response, host):
+        """Content heuristic deciding whether an HTTP response is usable as-is"""
+        content_type = response["headers"].get("Content-Type", "")
+        if content_type and "html" not in content_type:
+            return True
+        
+        content = response["content"]
+        if not content or len(content) < MIN_CONTENT_LENGTH:
+            return True
+        
+        try:
+            document = lxml.html.fromstring(content)
+        except Exception:
+            return True
+        
+        # Pages that build their body with scripts come back with an empty body
+        if not any(text.strip() for text in BODY_TEXT_XPATH(document)):
+            return True
+        
+        selector = lookup_domain_setting(host, EXPECTED_SELECTORS)
+        if selector and not document.cssselect(selector):
+            return True
         
-        # Base wait time for backoff (2 seconds)
-        base_delay = 2
+        return False
+
+    def _fetch_with_browser(self, url, timings=None):
+        """
+        Fetches page content in a pooled browser, retrying as the rate controller allows.
+        Returns a response dict whose stats describe the page load, or None.
+        """
+        domain = urlparse(url).netloc
 
         for attempt in range(MAX_RETRIES):
+            with metrics.stage("acquire", timings):
+                browser = self.browser_pool.acquire()
+            if browser is None:
+                logging.error("Undetected-chromedriver is not available")
+                return None
+            
+            proxy = self._driver_proxies.get(browser.driver)
             try:
                 logging.info(f"Fetching {url} (Attempt {attempt+1}/{MAX_RETRIES})")
-                
-                # CLAIM: Heuristic Behavior (Randomized delays)
-                time.sleep(random.uniform(2, 4))
-                
-                self.driver.get(url)
-                
-                # Domain-specific waiting strategies
-                if 'imdb.com' in domain:
-                    try:
-                        WebDriverWait(self.driver, SELENIUM_WAIT_TIMEOUT).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, '.ipc-metadata-list, .lister-list')))
-                    except TimeoutException:
-                         logging.warning("IMDb specific element not found, checking body...")
-                
-                # Generic fallback wait
-                WebDriverWait(self.driver, SELENIUM_WAIT_TIMEOUT).until(
-                    EC.presence_of_element_located((By.TAG_NAME, 'body')))
-                
-                # Scroll to trigger lazy-loaded content
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1.5)
-                self.driver.execute_script("window.scrollTo(0, 0);")
-                
-                content = self.driver.page_source
-                if content and len(content) > 1000:
+                # Only navigation counts as response time: waiting for the page to settle and
+                # scrolling it take long on healthy servers too
+                content, stats, elapsed = self._load_page(browser.driver, url, timings)
+                self.rate_controller.record(domain, elapsed=elapsed, size=len(content) if content else 0)
+                if content and len(content) > MIN_CONTENT_LENGTH:
+                    self._report_proxy(proxy, True, elapsed)
                     logging.info(f"Successfully fetched content from {url} ({len(content)} bytes)")
-                    return content
+                    # page_source is only available as a whole; longer pages are cut like HTTP bodies
+                    content, truncated = _cap_page(content)
+                    if truncated:
+                        logging.warning(f"Truncated {url} at {MAX_PAGE_BYTES} bytes")
+                    return {
+                        "url": url,
+                        "status_code": None,
+                        "content": content,
+                        "headers": {},
+                        "fetched_with": "browser",
+                        "stats": stats,
+                        "truncated": truncated,
+                    }
                 
+                # Block pages and captchas are small, so a proxy serving them is penalized
+                self._report_proxy(proxy, False)
                 logging.warning(f"Fetched page but content is small: {len(content)} bytes")
                 
             except (WebDriverException, TimeoutException) as e:
                 logging.warning(f"Attempt {attempt+1} failed: {str(e)[:100]}")
-                # Optional: Restart driver on severe failures
+                self.rate_controller.record(domain, failed=True)
+                self._report_proxy(proxy, False)
+                # Optional: Replace the browser on severe failures
                 if attempt > 1:
-                    logging.info("Restarting driver to rotate identity...")
-                    self.close()
-                    self.driver = self._init_selenium()
-
-            # CLAIM: Exponential Backoff Logic
-            # Formula: base * (2^attempt) + jitter
-            # Sequence: ~2s, ~4s, ~8s, ~16s...
-            if attempt < MAX_RETRIES - 1:
-                backoff_time = (base_delay * (2 ** attempt)) + random.uniform(0.5, 1.5)
-                logging.info(f"Backing off for {backoff_time:.2f}s before retry...")
+                    logging.info("Retiring browser to rotate identity...")
+                    browser.retire()
+            finally:
+                if proxy and not self.proxy_rotator.is_available(proxy):
+                    logging.info(f"Retiring browser behind unhealthy proxy {proxy}")
+                    browser.retire()
+                self.browser_pool.release(browser)
+
+            # CLAIM: Adaptive Backoff Logic
+            # Each failure halves the domain's request rate, and retries come out of
+            # a budget shared by all workers instead of a fixed per-request sequence
+            if attempt == MAX_RETRIES - 1 or not self.rate_controller.try_retry(domain):
+                break
+            backoff_time = self.rate_controller.wait_time(domain)
+            logging.info(f"Backing off for {backoff_time:.2f}s before retry...")
+            with metrics.stage("backoff", timings):
                 time.sleep(backoff_time)
         
-        logging.error(f"All {MAX_RETRIES} attempts failed for {url}")
+        logging.error(f"Giving up on {url} after {attempt + 1} attempts")
         return None
 
+    def _report_proxy(self, proxy, success, latency=None):
+        if proxy:
+            self.proxy_rotator.report(proxy, success, latency)
+
+    def _load_page(self, driver, url, timings=None):
+        """
+        Navigates a leased driver to the URL and waits until the page is ready.
+        Returns the rendered HTML, the network stats of the page load and the seconds
+        spent in navigation.
+        """
+        host = get_host(url)
+        self._apply_blocking(driver, host)
+        monitor = NetworkMonitor(driver)
+        
+        # Pacing between requests is left to the scheduler and the rate controller
+        started = time.monotonic()
+        with metrics.stage("navigate", timings):
+            driver.get(url)
+        navigate_seconds = time.monotonic() - started
+        with metrics.stage("ready", timings):
+            wait_until_ready(driver, host, monitor)
+        
+        return driver.page_source, monitor.stats(), navigate_seconds
+
+    def _apply_blocking(self, driver, host):
+        """Switches the driver to the host's resource-blocking profile if it is not active yet"""
+        profile = lookup_domain_setting(host, RESOURCE_BLOCKING_PROFILES, RESOURCE_BLOCKING_DEFAULT)
+        patterns = [pattern for name in profile for pattern in BLOCKED_RESOURCE_PATTERNS.get(name, [])]
+        if self._driver_blocking.get(driver) == patterns:
+            return
+        try:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {"urls": patterns})
+            self._driver_blocking[driver] = patterns
+        except WebDriverException as e:
+            logging.warning(f"Could not apply resource blocking for {host}: {str(e)[:100]}")
+
     def close(self):
-        if self.driver:
-            try:
-                self.driver.quit()
-            except Exception:
-                pass
-            logging.info("Undetected-chromedriver closed")
-            self.driver = None
+        self.http_fetcher.close()
+        self.browser_pool.close()
@@ -0,0 +1,172 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+from config import MAX_CONCURRENT_PER_DOMAIN, RESPECT_ROBOTS_TXT
+from .rate_controller import RateController
+
+class RobotsCache:
+    """Fetches and caches robots.txt rules per site"""
+
+    def __init__(self, http_fetcher):
+        self.http_fetcher = http_fetcher
+        self._rules = {}
+        self._lock = threading.Lock()
+        self._site_locks = {}
+
+    def get(self, url):
+        """Returns the parsed robots.txt rules for the URL's site"""
+        parsed = urlparse(url)
+        site = f"{parsed.scheme}://{parsed.netloc}"
+
+        with self._lock:
+            if site in self._rules:
+                return self._rules[site]
+            site_lock = self._site_locks.setdefault(site, threading.Lock())
+
+        # Only one worker fetches a given robots.txt; the others wait for it
+        with site_lock:
+            with self._lock:
+                if site in self._rules:
+                    return self._rules[site]
+            rules = self._fetch(site)
+            with self._lock:
+                self._rules[site] = rules
+            return rules
+
+    def _fetch(self, site):
+        rules = RobotFileParser(f"{site}/robots.txt")
+        response = self.http_fetcher.fetch(rules.url)
+
+        if response is None:
+            rules.allow_all = True
+        elif response["status_code"] in (401, 403):
+            rules.disallow_all = True
+        elif response["status_code"] >= 400:
+            rules.allow_all = True
+        else:
+            rules.parse(response["content"].splitlines())
+
+        logging.info(f"Loaded robots.txt for {site}")
+        return rules
+
+
+class DomainScheduler:
+    """
+    Hands out URLs to concurrent workers so that different domains are fetched
+    in parallel while each domain keeps its own delay and concurrency budget.
+    Delays come from the rate controller, which adapts them to how each domain responds.
+    """
+
+    def __init__(self, http_fetcher, rate_controller=None,
+                 max_per_domain=MAX_CONCURRENT_PER_DOMAIN, respect_robots=RESPECT_ROBOTS_TXT):
+        self.rate_controller = rate_controller or RateController()
+        self.max_per_domain = max_per_domain
+        self.robots = RobotsCache(http_fetcher) if respect_robots else None
+
+        self._queues = {}        # domain -> deque of (pending URL, monotonic time it was queued)
+        self._active = {}        # domain -> URLs currently being fetched
+        self._next_allowed = {}  # domain -> earliest monotonic time of the next fetch
+        self._crawl_delays = {}  # domain -> robots.txt crawl-delay
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def add(self, url):
+        domain = urlparse(url).netloc
+        with self._condition:
+            self._queues.setdefault(domain, deque()).append((url, time.monotonic()))
+            self._condition.notify_all()
+
+    def get(self):
+        """
+        Blocks until a URL whose domain is ready can be handed out.
+        Returns (url, seconds it was queued), or None once the scheduler has been closed.
+        """
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                entry, wait_time = self._next_ready(now)
+                if entry:
+                    url, queued_at = entry
+                    return url, now - queued_at
+                self._condition.wait(timeout=wait_time)
+            return None
+
+    def done(self, url):
+        """Releases the domain slot and starts its politeness delay"""
+        domain = urlparse(url).netloc
+        with self._condition:
+            self._active[domain] -= 1
+            next_allowed = max(time.monotonic() + self._delay(domain), self.rate_controller.blocked_until(domain))
+            self._next_allowed[domain] = max(self._next_allowed.get(domain, 0), next_allowed)
+            self._condition.notify_all()
+
+    def is_idle(self):
+        """True when no URL is queued or being fetched"""
+        with self._condition:
+            return not any(self._queues.values()) and not any(self._active.values())
+
+    def close(self):
+        """Releases every worker blocked in get()"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def pending_count(self):
+        """Number of URLs queued but not yet handed out"""
+        with self._condition:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def pending_domains(self):
+        with self._condition:
+            return [domain for domain, queue in self._queues.items() if queue]
+
+    def allowed(self, url):
+        """Checks robots.txt and picks up the site's crawl-delay"""
+        if not self.robots:
+            return True
+
+        rules = self.robots.get(url)
+        crawl_delay = rules.crawl_delay("*")
+        if crawl_delay:
+            with self._condition:
+                self._crawl_delays[urlparse(url).netloc] = float(crawl_delay)
+        return rules.can_fetch("*", url)
+
+    def _next_ready(self, now):
+        """Pops a URL from the domain that has been waiting longest"""
+        best_domain = None
+        wait_time = None
+        for domain, queue in self._queues.items():
+            if not queue or self._active.get(domain, 0) >= self.max_per_domain:
+                continue
+            next_allowed = self._next_allowed.get(domain, 0)
+            if next_allowed <= now:
+                if best_domain is None or next_allowed < self._next_allowed.get(best_domain, 0):
+                    best_domain = domain
+            elif wait_time is None or next_allowed - now < wait_time:
+                wait_time = next_allowed - now
+
+        if best_domain is None:
+            return None, wait_time
+
+        self._active[best_domain] = self._active.get(best_domain, 0) + 1
+        # Stagger parallel fetches to the same domain
+        self._next_allowed[best_domain] = now + self._delay(best_domain)
+        return self._queues[best_domain].popleft(), None
+
+    def _delay(self, domain):
+        # Adaptive delay, never below crawl-delay
+        return max(self.rate_controller.next_delay(domain), self._crawl_delays.get(domain, 0))
@@ -8,72 +8,270 @@ This web scraping tool is intended for educational purposes only. Users are resp
 
 Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
 """
+import hashlib
 import logging
-import time
 import random
-from urllib.parse import urlparse
+import time
+from concurrent.futures import ThreadPoolExecutor
 from .request_handler import RequestHandler
-from .parser import Parser
+from .parse_pool import ParserPool
+from .scheduler import DomainScheduler
+from .frontier import Frontier
+from utils.archive import ArchiveWriter
 from utils.database import Database
+from utils.metrics import metrics, MetricsExporter
+from config import SPIDER_WORKERS, FRONTIER_CONFIG, ARCHIVE_CONFIG
 
 class Spider:
-    def __init__(self, urls, db_config):
+    def __init__(self, urls, db_config, workers=SPIDER_WORKERS, shared=False):
         self.urls = urls
         self.db_config = db_config
+        self.workers = workers
+        # Shared spiders are worker processes that crawl a run together with others
+        self.shared = shared
         self.request_handler = RequestHandler()
-        self.parser = Parser()
-        self.database = Database()
+        self.parser_pool = ParserPool()
+        self.database = Database(db_config.get("path"))
+        self.scheduler = DomainScheduler(self.request_handler.http_fetcher, self.request_handler.rate_controller)
+        self.frontier = Frontier(max_leased_domains=FRONTIER_CONFIG["max_leased_domains"] if shared else None)
+        self.archive = ArchiveWriter() if ARCHIVE_CONFIG["enabled"] else None
+        self.metrics_exporter = MetricsExporter()
         logging.info("Web scraper initialized")
 
-    def run(self):
-        logging.info(f"Starting scraping of {len(self.urls)} URLs")
-        
-        # Shuffle URLs to avoid predictable patterns
-        random.shuffle(self.urls)
+    def run(self, resume=False):
+        """
+        Crawls from the seed URLs, or with resume=True continues the last run
+        that did not complete instead of starting over.
+        A shared spider joins the run that is in progress instead.
+        """
+        if self.shared:
+            if self.frontier.join_run() is None:
+                logging.error("No running crawl to join, start one with `main.py worker`")
+                self._close(completed=False)
+                return
+            logging.info(f"Worker {self.frontier.worker_id} joined crawl run {self.frontier.run_id}")
+        elif not (resume and self.frontier.resume_run()):
+            if resume:
+                logging.info("No unfinished crawl to resume, starting a new one")
+            logging.info(f"Starting scraping of {len(self.urls)} URLs with {self.workers} workers")
+            
+            # Shuffle URLs to avoid predictable patterns
+            random.shuffle(self.urls)
+            self.frontier.start_run()
+            self.frontier.add_seeds(self.urls)
         
-        for i, url in enumerate(self.urls):
-            try:
-                logging.info(f"Processing URL {i+1}/{len(self.urls)}: {url}")
-                
-                # Fetch page content
-                content = self.request_handler.fetch_page(url)
-                if not content:
-                    self.database.log_request(url, "failed", 0)
-                    continue
-                
-                # Parse content
-                parsed_data = self.parser.parse(content, url)
-                if not parsed_data:
-                    self.database.log_request(url, "parse_failed", len(content))
-                    continue
-                
-                # Save to database - generic content
-                success = self.database.save_content(
-                    url=url,
-                    domain=parsed_data["domain"],
-                    title=parsed_data["title"],
-                    content=parsed_data["content"],
-                    links=parsed_data["links"]
-                )
-                
-                # For IMDb top 250 movies
-                if 'imdb.com/chart/top' in url and parsed_data["movies"]:
-                    self.database.save_imdb_movies(parsed_data["movies"], url)
-                
-                if success:
-                    self.database.log_request(url, "success", len(content))
-                else:
-                    self.database.log_request(url, "save_failed", len(content))
-                
-            except Exception as e:
-                logging.error(f"Error processing {url}: {e}", exc_info=True)
-                self.database.log_request(url, "error", 0)
-            finally:
-                # Add random delay between requests (2-5 seconds)
-                delay = random.uniform(2, 5)
-                logging.info(f"Waiting {delay:.1f} seconds before next request")
-                time.sleep(delay)
+        self.request_handler.warm_up(self.urls)
+        self.metrics_exporter.start()
         
-        logging.info("Scraping completed")
+        completed = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="spider") as executor:
+                for _ in range(self.workers):
+                    executor.submit(self._worker)
+                try:
+                    self._coordinate()
+                finally:
+                    # Lets the workers finish their current URL and exit, also on Ctrl+C
+                    self.scheduler.close()
+            completed = True
+            logging.info("Scraping completed")
+        finally:
+            self._close(completed)
+
+    def _close(self, completed):
         self.request_handler.close()
+        self.parser_pool.close()
+        # Commits the last pages, which also marks them done in the frontier
+        self.database.flush()
+        if not self.shared:
+            self.frontier.end_run("completed" if completed else "interrupted")
+        elif completed and self.frontier.exhausted():
+            # The last worker to run out of work closes the run; interrupted workers
+            # leave it running for the others and hand their leases back on close
+            self.frontier.end_run("completed")
+        self.frontier.close()
+        if self.archive:
+            self.archive.close()
         self.database.close()
+        self.metrics_exporter.stop()
+
+    def _coordinate(self):
+        """Keeps the scheduler fed and stops the workers once the crawl is exhausted"""
+        while True:
+            self._refill()
+            # A page leaves the scheduler before it is parsed and parsing adds links
+            # to the frontier, so the frontier has to be checked last. Other worker
+            # processes can still add links while they hold leased URLs.
+            if self.scheduler.is_idle() and self.parser_pool.is_idle() and not self._refill() \
+                    and self.frontier.exhausted():
+                break
+            time.sleep(0.1)
+
+    def _worker(self):
+        """Fetches URLs as the scheduler releases them"""
+        while True:
+            entry = self.scheduler.get()
+            if entry is None:
+                return
+            url, queued = entry
+            # Stage timings and fetch stats of this URL, stored with its scraping_log entry
+            stats = {}
+            metrics.record_stage("queue", queued, stats)
+            try:
+                self._process_url(url, stats)
+            finally:
+                # Starts the per-domain delay before the next request
+                self.scheduler.done(url)
+            self._refill()
+
+    def _refill(self):
+        """Moves the next batch of frontier URLs into the scheduler"""
+        if self.scheduler.pending_count() >= self.workers:
+            return False
+        urls = self.frontier.pop(self.workers, skip_domains=self.scheduler.pending_domains())
+        for url in urls:
+            self.scheduler.add(url)
+        return bool(urls)
+
+    def _process_url(self, url, stats):
+        """Fetches a single URL and hands it to the parser pool"""
+        try:
+            logging.info(f"Processing URL: {url}")
+            
+            if not self.scheduler.allowed(url):
+                logging.warning(f"Skipping {url}: disallowed by robots.txt")
+                self.database.log_request(url, "robots_disallowed", 0, stats)
+                self.frontier.finish(url, "skipped")
+                return
+            
+            # Fetch page content, conditionally if we have seen it before
+            cached = self.database.get_validators(url)
+            response = self.request_handler.fetch(url, cached, stats)
+            if response:
+                stats.update(response.get("stats") or {})
+            if response and response["status_code"] == 304:
+                self._skip_unchanged(url, 0, stats)
+                return
+            
+            content = response["content"] if response else None
+            if not content:
+                self.database.log_request(url, "failed", 0, stats)
+                self.frontier.finish(url, "failed")
+                return
+            
+            # Error pages (a 429 or 503 the retries could not get past, a 404) are not content;
+            # failed URLs are retried on --resume up to CRAWL_MAX_ATTEMPTS
+            if response["status_code"] and response["status_code"] >= 400:
+                logging.warning(f"{url} returned HTTP {response['status_code']}")
+                self.database.log_request(url, "failed", len(content), stats)
+                self.frontier.finish(url, "failed")
+                return
+            
+            # Skip parse and save when the page is byte-identical to the last fetch
+            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            if cached and cached["content_hash"] == content_hash:
+                self._skip_unchanged(url, len(content), stats)
+                return
+            
+            # The raw page is kept before parsing, so a page that fails to parse can be re-parsed later
+            archive_record_id = self._archive(url, response)
+            
+            # Parsing happens in the parser pool, saving continues in its callback
+            validators = {
+                "etag": response["headers"].get("ETag"),
+                "last_modified": response["headers"].get("Last-Modified"),
+                "content_hash": content_hash,
+            }
+            self.parser_pool.submit(
+                content, url,
+                lambda parsed_data, parse_seconds: self._save_parsed(
+                    url, len(content), validators, parsed_data, parse_seconds, stats, archive_record_id,
+                    response.get("truncated", False))
+            )
+            
+        except Exception as e:
+            logging.error(f"Error processing {url}: {e}", exc_info=True)
+            self.database.log_request(url, "error", 0, stats)
+            self.frontier.finish(url, "failed")
+
+    def _save_parsed(self, url, size, validators, parsed_data, parse_seconds, stats, archive_record_id=None,
+                     fetch_truncated=False):
+        """Stores a parsed page and queues its links"""
+        metrics.record_stage("parse", parse_seconds, stats)
+        try:
+            if not parsed_data:
+                self.database.log_request(url, "parse_failed", size, stats)
+                self.frontier.finish(url, "failed")
+                return
+            
+            # Cut off by MAX_PAGE_BYTES when fetched, or by the stream parser's limits
+            if fetch_truncated:
+                metrics.inc("scraper_truncated_pages_total", stage="fetch")
+            elif parsed_data.get("truncated"):
+                metrics.inc("scraper_truncated_pages_total", stage="parse")
+            
+            # The validators and the log entry are committed with the content, or not at all
+            with self._page_transaction(url):
+                # Compressing and queueing the records; the writes themselves are timed per batch
+                with metrics.stage("save", stats):
+                    # Save to database - generic content
+                    self.database.save_content(
+                        url=url,
+                        domain=parsed_data["domain"],
+                        title=parsed_data["title"],
+                        content=parsed_data["content"],
+                        links=parsed_data["links"],
+                        archive_record_id=archive_record_id,
+                        extractor=parsed_data.get("extractor"),
+                        parser_version=parsed_data.get("parser_version"),
+                        truncated=fetch_truncated or parsed_data.get("truncated", False)
+                    )
+                    
+                    # For IMDb top 250 movies
+                    if parsed_data["movies"]:
+                        self.database.save_imdb_movies(parsed_data["movies"], url)
+                    # Typed records of extraction rules that store them
+                    if parsed_data["records"]:
+                        self.database.save_records(url, parsed_data["records"])
+                    
+                    self.database.save_validators(url, **validators)
+                
+                self.database.log_request(url, "success", size, stats)
+                # Follow discovered links; queued before the page can be finished
+                self.frontier.add_links(parsed_data["links"], self.frontier.depth(url) + 1)
+            
+        except Exception as e:
+            logging.error(f"Error saving {url}: {e}", exc_info=True)
+            self.database.log_request(url, "error", size, stats)
+            self.frontier.finish(url, "failed")
+
+    def _archive(self, url, response):
+        """Appends the fetched page to the archive; returns its record id or None"""
+        if not self.archive:
+            return None
+        # Timed on its own like db_write, so it does not skew the fetch timings
+        with metrics.stage("archive"):
+            entry = self.archive.write(url, response["content"], response["status_code"],
+                                       response["headers"], response.get("fetched_with", "http"))
+        if entry is None:
+            return None
+        self.database.index_archive_record(entry)
+        return entry["record_id"]
+
+    def _skip_unchanged(self, url, bytes_transferred, stats):
+        """Logs an unchanged page and re-queues the links stored with its last copy"""
+        logging.info(f"Skipping unchanged page {url}")
+        with self._page_transaction(url):
+            self.database.log_request(url, "not_modified", bytes_transferred, stats)
+            self.frontier.add_links(self.database.get_links(url), self.frontier.depth(url) + 1)
+
+    def _page_transaction(self, url):
+        """
+        Groups the writes for a URL into one transaction and marks the URL done once the writer
+        has committed it, or failed if it could not. Until then it stays leased, so a crash
+        before the commit leaves it to be fetched again.
+        """
+        def failed():
+            logging.error(f"Could not store {url}")
+            self.frontier.finish(url, "failed")
+        return self.database.transaction(on_commit=lambda: self.frontier.finish(url), on_failure=failed)
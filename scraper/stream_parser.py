@@ -0,0 +1,261 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import logging
+from urllib.parse import urlparse, urljoin
+import lxml.etree
+from .extraction import GENERIC_EXTRACTOR, GENERIC_PARSER_VERSION
+from .lxml_parser import LxmlParser, RULES, GENERIC_EXCLUDED, GENERIC_REMOVED_TAGS
+from config import MAX_PAGE_BYTES, PARSER_MAX_ELEMENTS, STREAM_CHUNK_BYTES
+
+def _has_class(element, name):
+    value = element.get('class')
+    return value is not None and (name in value.split() or value == name)
+
+def _char_boundary(data, size):
+    """The largest offset up to size that does not split a UTF-8 character of data"""
+    while 0 < size < len(data) and data[size] & 0xC0 == 0x80:
+        size -= 1
+    return size
+
+# Containers of the generic main content, in order of preference (as in _extract_generic_content)
+CANDIDATES = (
+    lambda element: element.tag == 'main',
+    lambda element: element.tag == 'article',
+    lambda element: element.tag == 'div' and _has_class(element, 'content'),
+    lambda element: element.tag == 'div' and _has_class(element, 'main-content'),
+    lambda element: element.tag == 'div' and element.get('id') == 'content',
+    lambda element: element.tag == 'body',
+)
+REMOVED_TAGS = set(GENERIC_REMOVED_TAGS)
+
+
+class _Candidate:
+    """The first element matching one of CANDIDATES, and the text read inside it"""
+
+    def __init__(self, element, excluded, removed):
+        self.element = element
+        self.excluded = excluded  # Exclusion depth outside the container
+        self.removed = removed
+        self.strings = []
+        self.open = True
+
+
+class StreamParser:
+    """
+    Parser backend that reads pages with lxml's pull parser in one pass and bounded memory.
+    Title, links and the generic main-content text are taken from parse events, and every
+    element is dropped as soon as it has ended, so only the open elements are ever in memory.
+    Parsing stops after max_page_bytes of HTML or max_elements elements and the result is
+    flagged as truncated. Pages with a domain rule need the whole tree for their selectors;
+    they are parsed by the lxml backend.
+    """
+
+    def __init__(self, max_page_bytes=MAX_PAGE_BYTES, max_elements=PARSER_MAX_ELEMENTS,
+                 chunk_bytes=STREAM_CHUNK_BYTES):
+        self.max_page_bytes = max_page_bytes
+        self.max_elements = max_elements
+        self.chunk_bytes = chunk_bytes
+        self.tree_parser = LxmlParser()
+
+    def parse(self, html_content, url):
+        """Parse content from any website"""
+        if not html_content:
+            logging.error(f"Parser received no HTML content for URL: {url}")
+            return None
+
+        if RULES.resolve(url):
+            return self.tree_parser.parse(html_content, url)
+
+        try:
+            return self._parse_stream(html_content, url)
+        except Exception as e:
+            logging.error(f"Error parsing content from {url}: {e}", exc_info=True)
+            return None
+
+    def _chunks(self, html_content):
+        """UTF-8 chunks of the page up to max_page_bytes, each with whether the page is cut after it"""
+        sent = 0
+        for chunk in self._encode(html_content):
+            if sent + len(chunk) > self.max_page_bytes:
+                # A character split by the cut is dropped, as in _cap_page
+                yield chunk[:_char_boundary(chunk, self.max_page_bytes - sent)], True
+                return
+            sent += len(chunk)
+            yield chunk, False
+
+    def _encode(self, html_content):
+        """
+        The page as UTF-8 in pieces of at most chunk_bytes that end on character boundaries.
+        It is encoded a slice at a time, so there is no second full copy.
+        """
+        pending = b""
+        for start in range(0, len(html_content), self.chunk_bytes):
+            pending += html_content[start:start + self.chunk_bytes].encode('utf-8')
+            while len(pending) >= self.chunk_bytes:
+                size = _char_boundary(pending, self.chunk_bytes) or self.chunk_bytes
+                yield pending[:size]
+                pending = pending[size:]
+        if pending:
+            yield pending
+
+    def _parse_stream(self, html_content, url):
+        parser = lxml.etree.HTMLPullParser(events=('start', 'end', 'comment', 'pi'), encoding='utf-8')
+        state = _StreamState(url)
+        truncated = False
+        within_budget = True
+        for chunk, cut in self._chunks(html_content):
+            parser.feed(chunk)
+            within_budget = state.handle(parser.read_events(), self.max_elements)
+            if cut or not within_budget:
+                truncated = True
+                break
+        if within_budget:
+            # Closes the elements still open, so the text before their end tags is read too
+            parser.close()
+            within_budget = state.handle(parser.read_events(), self.max_elements)
+            truncated = truncated or not within_budget
+        if truncated:
+            logging.warning(f"Truncated {url} after {min(state.elements, self.max_elements)} elements")
+
+        return {
+            "domain": urlparse(url).netloc,
+            "title": state.title,
+            "content": state.content(),
+            "links": state.links(),
+            "movies": [],
+            "records": {},
+            "extractor": GENERIC_EXTRACTOR,
+            "parser_version": GENERIC_PARSER_VERSION,
+            "truncated": truncated,
+        }
+
+
+class _StreamState:
+    """
+    Follows the parse events of one page. Every text node is read exactly once, in
+    document order: the text before an element when it starts, the text before an
+    end tag when it ends.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.elements = 0
+        self.title = ""
+        self._title_seen = False
+        self._excluded = 0  # Open elements whose text is skipped
+        self._removed = 0  # Open elements the generic extraction removes, with their links
+        self._candidates = [None] * len(CANDIDATES)
+        self._pending = list(enumerate(CANDIDATES))  # Candidates not found yet
+        self._links = {}  # URL -> candidates for which every occurrence was in a removed element
+        self._resolved = {}  # href -> absolute URL, None if it is filtered out
+
+    def handle(self, events, max_elements):
+        """Processes parse events; False once the element budget is used up"""
+        for event, element in events:
+            if event == 'start':
+                self.elements += 1
+                if self.elements > max_elements:
+                    return False
+                self._emit(self._text_before(element))
+                self._start(element)
+            elif event == 'end':
+                self._emit(element[-1].tail if len(element) else element.text)
+                self._end(element)
+            else:
+                # Comments and processing instructions only contribute the text around them
+                self._emit(self._text_before(element))
+        return True
+
+    @staticmethod
+    def _text_before(element):
+        previous = element.getprevious()
+        if previous is not None:
+            return previous.tail
+        parent = element.getparent()
+        return parent.text if parent is not None else None
+
+    def _emit(self, text):
+        if not text:
+            return
+        text = text.strip()
+        if not text:
+            return
+        for candidate in self._candidates:
+            if candidate is not None and candidate.open and candidate.excluded == self._excluded:
+                candidate.strings.append(text)
+
+    def _start(self, element):
+        tag = element.tag
+        for i, matches in self._pending:
+            if matches(element):
+                self._candidates[i] = _Candidate(element, self._excluded, self._removed)
+                self._pending = [(j, other) for j, other in self._pending if j != i]
+        if tag in GENERIC_EXCLUDED:
+            self._excluded += 1
+        if tag in REMOVED_TAGS:
+            self._removed += 1
+        if tag == 'a':
+            self._add_link(element.get('href'))
+
+    def _end(self, element):
+        tag = element.tag
+        if tag == 'title' and not self._title_seen:
+            self._title_seen = True
+            self.title = (element.text or "").strip()
+        if tag in GENERIC_EXCLUDED:
+            self._excluded -= 1
+        if tag in REMOVED_TAGS:
+            self._removed -= 1
+        for candidate in self._candidates:
+            if candidate is not None and candidate.element is element:
+                candidate.open = False
+                candidate.element = None
+
+        # The element is done: drop its subtree and the finished siblings before it.
+        # Its tail is still needed by whatever follows.
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+    def _add_link(self, href):
+        if href is None:
+            return
+        if href not in self._resolved:
+            self._resolved[href] = self._resolve(href)
+        absolute_url = self._resolved[href]
+        if absolute_url is None:
+            return
+        # The tree backends drop removed elements from the chosen container before reading
+        # links, so a link only counts for a container if it occurs outside its removed parts
+        removed_in = {i for i, candidate in enumerate(self._candidates)
+                      if candidate is not None and candidate.open and self._removed > candidate.removed}
+        kept = self._links.get(absolute_url)
+        self._links[absolute_url] = removed_in if kept is None else kept & removed_in
+
+    def _resolve(self, href):
+        """Same filtering as LxmlParser._extract_links"""
+        href = href.strip()
+        if not href or href.startswith(('javascript:', 'mailto:', 'tel:')):
+            return None
+        absolute_url = urljoin(self.url, href)
+        if not absolute_url.startswith('http') or any(x in absolute_url for x in ['/ad/', '/track/', '/click?']):
+            return None
+        return absolute_url
+
+    def content(self):
+        candidate = next((candidate for candidate in self._candidates if candidate is not None), None)
+        return " ".join(candidate.strings) if candidate else ""
+
+    def links(self):
+        chosen = next((i for i, candidate in enumerate(self._candidates) if candidate is not None), None)
+        return [link for link, removed_in in self._links.items() if chosen not in removed_in]
@@ -0,0 +1,195 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import gzip
+import logging
+import mmap
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.client import responses as HTTP_REASONS
+from config import ARCHIVE_CONFIG
+
+# Headers describing the transfer rather than the page; the stored payload is already decoded
+TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+def _warc_record(warc_type, headers, payload):
+    """One WARC/1.1 record: header block, blank line, payload, two line breaks"""
+    headers = {"WARC-Type": warc_type, **headers, "Content-Length": str(len(payload))}
+    head = "WARC/1.1\r\n" + "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+    return head.encode("utf-8") + payload + b"\r\n\r\n"
+
+def _http_block(status_code, headers, body):
+    """HTTP response message of an archived fetch"""
+    reason = HTTP_REASONS.get(status_code, "")
+    lines = [f"HTTP/1.1 {status_code} {reason}".rstrip()]
+    for name, value in (headers or {}).items():
+        if name.lower() == "content-type":
+            # The body is stored as UTF-8 whatever the page was served in
+            value = value.split(";")[0].strip() + "; charset=utf-8"
+        if name.lower() not in TRANSFER_HEADERS:
+            lines.append(f"{name}: {value}")
+    lines.append(f"Content-Length: {len(body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + body
+
+def _parse_headers(block):
+    headers = {}
+    for line in block.split("\r\n"):
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip()] = value.strip()
+    return headers
+
+
+class ArchiveWriter:
+    """
+    Appends fetched pages to WARC segments in a directory.
+    Every record is its own gzip member, so one record can be decompressed from its
+    offset and length alone. Segments are never rewritten: a new one is started once
+    the current one reaches segment_size. Each process writes its own segments.
+    """
+
+    def __init__(self, directory=None, config=ARCHIVE_CONFIG):
+        self.directory = directory or config["directory"]
+        self.segment_size = config["segment_size"]
+        self.compression_level = config["compression_level"]
+        self._prefix = f"{time.strftime('%Y%m%d%H%M%S')}-{socket.gethostname()}-{os.getpid()}"
+        self._sequence = 0
+        self._file = None
+        self._segment = None
+        # Spider threads archive pages concurrently, appends are serialized
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def write(self, url, content, status_code=None, headers=None, fetched_with="http"):
+        """
+        Archives a fetched page. HTTP fetches become response records with their
+        headers; rendered pages are resource records of the browser's DOM.
+        Returns the index entry of the record, or None if it could not be written.
+        """
+        record_id = f"<urn:uuid:{uuid.uuid4()}>"
+        fetched_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        body = content.encode("utf-8")
+        warc_headers = {
+            "WARC-Record-ID": record_id,
+            "WARC-Date": fetched_at,
+            "WARC-Target-URI": url,
+        }
+        if fetched_with == "browser":
+            record = _warc_record("resource", {**warc_headers, "Content-Type": "text/html; charset=utf-8"}, body)
+        else:
+            record = _warc_record("response", {**warc_headers, "Content-Type": "application/http;msgtype=response"},
+                                  _http_block(status_code or 200, headers, body))
+        data = gzip.compress(record, self.compression_level)
+
+        with self._lock:
+            try:
+                if self._file is None or self._file.tell() >= self.segment_size:
+                    self._open_segment()
+                offset = self._file.tell()
+                self._file.write(data)
+                # Readers map the segment, so the record has to reach the file before it is indexed
+                self._file.flush()
+            except OSError as e:
+                logging.error(f"Could not archive {url}: {e}")
+                return None
+            segment = self._segment
+
+        return {
+            "record_id": record_id,
+            "url": url,
+            "segment": segment,
+            "offset": offset,
+            "length": len(data),
+            "status": status_code,
+            "fetched_with": fetched_with,
+        }
+
+    def _open_segment(self):
+        if self._file:
+            self._file.close()
+        self._sequence += 1
+        self._segment = f"{self._prefix}-{self._sequence:05d}.warc.gz"
+        self._file = open(os.path.join(self.directory, self._segment), "ab")
+        info = f"software: web_scraper\r\nhostname: {socket.gethostname()}\r\nformat: WARC File Format 1.1\r\n"
+        self._file.write(gzip.compress(_warc_record("warcinfo", {
+            "WARC-Record-ID": f"<urn:uuid:{uuid.uuid4()}>",
+            "WARC-Date": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "WARC-Filename": self._segment,
+            "Content-Type": "application/warc-fields",
+        }, info.encode("utf-8")), self.compression_level))
+        logging.info(f"Archiving pages to {self._segment}")
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+class ArchiveReader:
+    """
+    Reads single records out of archive segments through memory maps, so a
+    lookup only touches the pages of the record instead of reading the file.
+    """
+
+    def __init__(self, directory=None, config=ARCHIVE_CONFIG):
+        self.directory = directory or config["directory"]
+        self._maps = {}
+        self._lock = threading.Lock()
+
+    def _map(self, segment, end):
+        """The segment's memory map, remapped if the segment has grown past it since"""
+        with self._lock:
+            mapped = self._maps.get(segment)
+            if mapped is None or len(mapped) < end:
+                # A replaced map may still be read by another thread; it is closed once unreferenced
+                with open(os.path.join(self.directory, segment), "rb") as f:
+                    mapped = self._maps[segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return mapped
+
+    def read(self, segment, offset, length):
+        """
+        Decompresses the record at offset in segment.
+        Returns a dict with the record's url, record_id, date, status, headers and
+        content, or None if the record cannot be read.
+        """
+        try:
+            record = gzip.decompress(self._map(segment, offset + length)[offset:offset + length])
+            head, _, payload = record.partition(b"\r\n\r\n")
+            warc_headers = _parse_headers(head.decode("utf-8"))
+            payload = payload[:int(warc_headers["Content-Length"])]
+        except (OSError, ValueError, KeyError, EOFError) as e:
+            logging.error(f"Could not read archive record at {segment}:{offset}: {e}")
+            return None
+
+        status, headers, body = None, {}, payload
+        if warc_headers.get("WARC-Type") == "response":
+            http_head, _, body = payload.partition(b"\r\n\r\n")
+            status_line, _, header_block = http_head.decode("utf-8", "replace").partition("\r\n")
+            status = int(status_line.split()[1])
+            headers = _parse_headers(header_block)
+        return {
+            "url": warc_headers.get("WARC-Target-URI"),
+            "record_id": warc_headers.get("WARC-Record-ID"),
+            "date": warc_headers.get("WARC-Date"),
+            "status": status,
+            "headers": headers,
+            "content": body.decode("utf-8"),
+        }
+
+    def close(self):
+        with self._lock:
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
@@ -0,0 +1,62 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import hashlib
+import math
+import struct
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set used for URL deduplication.
+    Membership tests can return false positives at roughly error_rate,
+    but never false negatives, and memory does not grow with the number of items.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        # Double hashing: k positions from two independent 64-bit hashes
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        """Adds an item. Returns False if it was (probably) already present."""
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        return added
+
+    def __contains__(self, item):
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                return False
+        return True
+
+    def to_bytes(self):
+        return bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data, capacity, error_rate=0.001):
+        """Restores a filter saved with to_bytes, or None if the sizing changed"""
+        bloom = cls(capacity, error_rate)
+        if len(data) != len(bloom.bits):
+            return None
+        bloom.bits = bytearray(data)
+        return bloom
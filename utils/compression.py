@@ -0,0 +1,68 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import logging
+import threading
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# zstd contexts are not thread-safe, so every thread keeps its own
+_local = threading.local()
+
+def _zstd_compressor(level):
+    compressors = _local.__dict__.setdefault("compressors", {})
+    if level not in compressors:
+        compressors[level] = zstandard.ZstdCompressor(level=level)
+    return compressors[level]
+
+def _zstd_decompressor():
+    if not hasattr(_local, "decompressor"):
+        _local.decompressor = zstandard.ZstdDecompressor()
+    return _local.decompressor
+
+def resolve_method(method):
+    """Returns the method that will actually be used, falling back to zlib without zstandard"""
+    if method == "zstd" and zstandard is None:
+        logging.warning("zstandard is not installed, compressing content with zlib")
+        return "zlib"
+    if method not in ("zstd", "zlib", "none"):
+        logging.warning(f"Unknown compression method {method!r}, compressing content with zlib")
+        return "zlib"
+    return method
+
+def compress(text, method, level=None, min_bytes=0):
+    """
+    Compresses text with a method returned by resolve_method().
+    Returns (value, method_used); short texts are stored as they are with method None.
+    """
+    if text is None:
+        return None, None
+    data = text.encode("utf-8")
+    if method == "none" or len(data) < min_bytes:
+        return text, None
+    if method == "zstd":
+        return _zstd_compressor(3 if level is None else level).compress(data), "zstd"
+    return zlib.compress(data, 6 if level is None else level), "zlib"
+
+def decompress(value, method):
+    """Reverses compress(); rows written before compression existed have method None"""
+    if value is None or method is None:
+        return value
+    if method == "zlib":
+        return zlib.decompress(value).decode("utf-8")
+    if method == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Content is zstd-compressed but zstandard is not installed")
+        return _zstd_decompressor().decompress(value).decode("utf-8")
+    raise ValueError(f"Unknown compression method {method!r}")
@@ -12,21 +12,116 @@ import sqlite3
 import logging
 import os
 import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from config import DATABASE_CONFIG
+from utils.compression import compress, decompress, resolve_method
+from utils.metrics import metrics, STAGES
+from utils.domains import get_host, domain_matches
+
+# Bumped whenever _migrate() learns a new step; databases of the original release are version 0
+SCHEMA_VERSION = 1
+
+# Optional per-request figures stored alongside each scraping_log entry
+NETWORK_COLUMNS = ("blocked_requests", "transferred_bytes")
+STAGE_COLUMNS = tuple(f"{stage}_ms" for stage in STAGES)
+LOG_STAT_COLUMNS = NETWORK_COLUMNS + STAGE_COLUMNS
+
+# Full-text index over the latest copy of every URL in scraped_content. The table is contentless:
+# it holds only the index, and search reads titles and text from scraped_content, while
+# indexed_pages records which row of each URL is indexed. FTS5 can only remove a contentless
+# entry given the exact text it indexed, so the writer removes the previous copy of a URL when
+# it saves a new one. The plain SQL triggers keep the schema usable from any SQLite client:
+# they drop rows deleted or edited elsewhere from search, and a rebuild clears their entries.
+FTS_TOKENIZER = "porter unicode61 remove_diacritics 2"
+FTS_SCHEMA = f'''
+    CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5(
+        title, content, content='',
+        tokenize='{FTS_TOKENIZER}'
+    );
+    CREATE TABLE IF NOT EXISTS indexed_pages (
+        url TEXT PRIMARY KEY,
+        page_id INTEGER NOT NULL UNIQUE
+    );
+    CREATE TRIGGER IF NOT EXISTS scraped_content_fts_delete AFTER DELETE ON scraped_content BEGIN
+        DELETE FROM indexed_pages WHERE page_id = old.id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS scraped_content_fts_update 
+    AFTER UPDATE OF url, title, content, compression ON scraped_content BEGIN
+        DELETE FROM indexed_pages WHERE page_id = old.id;
+    END;
+'''
+# Removes the indexed copy of a URL or page from content_fts. Runs on the writer's
+# connection, the only one that can decompress stored content in SQL.
+UNINDEX_SQL = """INSERT INTO content_fts (content_fts, rowid, title, content) 
+    SELECT 'delete', page.id, page.title, decompress(page.content, page.compression) 
+    FROM indexed_pages JOIN scraped_content AS page ON page.id = indexed_pages.page_id 
+    WHERE indexed_pages.{key} = ?"""
+
+def _plain_words(query):
+    """Quotes every word, so punctuation in a query is not read as FTS5 syntax"""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+def _snippets(match, pages):
+    """
+    Snippets of the text matching an FTS5 query in (title, content) pairs. content_fts holds no
+    text, so each page is indexed on its own in a scratch table that marks the passage with
+    the same tokenizer as the search.
+    """
+    scratch = sqlite3.connect(":memory:")
+    try:
+        scratch.execute(f"CREATE VIRTUAL TABLE page USING fts5(title, content, tokenize='{FTS_TOKENIZER}')")
+        snippets = []
+        for title, content in pages:
+            scratch.execute("DELETE FROM page")
+            scratch.execute("INSERT INTO page (title, content) VALUES (?, ?)", (title, content))
+            row = scratch.execute(
+                "SELECT snippet(page, 1, '[', ']', '...', 16) FROM page WHERE page MATCH ?", (match,)
+            ).fetchone()
+            snippets.append(row[0] if row else "")
+        return snippets
+    finally:
+        scratch.close()
+
 
 class Database:
-    def __init__(self):
-        self.db_path = DATABASE_CONFIG["path"]
+    def __init__(self, db_path=None):
+        self.db_path = db_path or DATABASE_CONFIG["path"]
         self.connection = None
         self.cursor = None
+        self.batch_size = DATABASE_CONFIG["batch_size"]
+        self.flush_interval = DATABASE_CONFIG["flush_interval"]
+        self.compression = resolve_method(DATABASE_CONFIG["compression"])
+        # Spider workers share one connection, so statements are serialized
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=DATABASE_CONFIG["queue_size"])
+        self._local = threading.local()  # Statements of the transaction open on this thread
         self._initialize_database()
+        
+        # Write-behind: a single thread turns queued records into batched transactions
+        self._writer = threading.Thread(target=self._writer_loop, name="db-writer", daemon=True)
+        self._writer.start()
 
     def _initialize_database(self):
         try:
-            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-            self.connection = sqlite3.connect(self.db_path)
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            # Worker processes share the database, so a write may have to wait for another one
+            self.connection = sqlite3.connect(self.db_path, timeout=DATABASE_CONFIG["busy_timeout"],
+                                              check_same_thread=False)
             self.cursor = self.connection.cursor()
             
+            # WAL lets readers run alongside the writer; NORMAL sync only fsyncs at checkpoints
+            self.cursor.execute(f"PRAGMA journal_mode={DATABASE_CONFIG['journal_mode']}")
+            self.cursor.execute(f"PRAGMA synchronous={DATABASE_CONFIG['synchronous']}")
+            self.cursor.execute(f"PRAGMA cache_size=-{DATABASE_CONFIG['cache_size_kb']}")
+            self.cursor.execute("PRAGMA temp_store=MEMORY")
+            # Lets plain SQL on this connection read compressed content
+            self.connection.create_function("decompress", 2, decompress, deterministic=True)
+            self.connection.create_function(
+                "host_matches", 2, lambda url, domain: domain_matches(get_host(url or ""), domain), deterministic=True)
+            
             # Table for storing scraped content
             self.cursor.execute('''
                 CREATE TABLE IF NOT EXISTS scraped_content (
@@ -35,8 +130,12 @@ class Database:
                     domain TEXT NOT NULL,
                     title TEXT,
                     content TEXT,
-                    links TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    compression TEXT,
+                    archive_record_id TEXT,
+                    extractor TEXT,
+                    parser_version TEXT,
+                    truncated INTEGER
                 )
             ''')
             
@@ -62,67 +161,638 @@ class Database:
                     url TEXT NOT NULL,
                     status TEXT NOT NULL,
                     bytes INTEGER,
+                    blocked_requests INTEGER,
+                    transferred_bytes INTEGER,
+                    queue_ms REAL,
+                    fetch_ms REAL,
+                    acquire_ms REAL,
+                    navigate_ms REAL,
+                    ready_ms REAL,
+                    backoff_ms REAL,
+                    parse_ms REAL,
+                    save_ms REAL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Table for HTTP validators and content hashes of the last fetch
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS page_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Link graph: every URL is stored once and pages point at it by id
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS urls (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL UNIQUE
+                )
+            ''')
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS page_links (
+                    page_id INTEGER NOT NULL,
+                    link_id INTEGER NOT NULL,
+                    PRIMARY KEY (page_id, link_id)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Typed records of extraction rules that store "records", one JSON object per row
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS extracted_records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Where each archived fetch is stored in the WARC segments of utils/archive.py
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS archive_index (
+                    record_id TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    segment TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    status INTEGER,
+                    fetched_with TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Last exported row id per named incremental export
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS export_watermarks (
+                    name TEXT PRIMARY KEY,
+                    table_name TEXT NOT NULL,
+                    last_id INTEGER NOT NULL,
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
             
+            self.cursor.executescript(FTS_SCHEMA)
+            
+            self._migrate()
+            
+            self.cursor.executescript('''
+                CREATE INDEX IF NOT EXISTS idx_page_links_link ON page_links (link_id, page_id);
+                CREATE INDEX IF NOT EXISTS idx_scraped_content_url ON scraped_content (url);
+                CREATE INDEX IF NOT EXISTS idx_scraped_content_domain ON scraped_content (domain);
+                CREATE INDEX IF NOT EXISTS idx_scraped_content_timestamp ON scraped_content (timestamp);
+                CREATE INDEX IF NOT EXISTS idx_scraping_log_url ON scraping_log (url);
+                CREATE INDEX IF NOT EXISTS idx_scraping_log_timestamp ON scraping_log (timestamp);
+                CREATE INDEX IF NOT EXISTS idx_imdb_movies_url ON imdb_movies (url);
+                CREATE INDEX IF NOT EXISTS idx_archive_index_url ON archive_index (url);
+                CREATE INDEX IF NOT EXISTS idx_extracted_records_url ON extracted_records (url);
+            ''')
+            
             self.connection.commit()
             logging.info("Database initialized.")
         except Exception as e:
             logging.error(f"Database initialization failed: {e}", exc_info=True)
             raise
 
-    def save_content(self, url, domain, title, content, links):
-        """Saves scraped content to the database"""
-        try:
-            # Serialize links list to JSON string
-            links_json = json.dumps(links)
-            
-            self.cursor.execute(
-                """INSERT INTO scraped_content 
-                (url, domain, title, content, links) 
-                VALUES (?, ?, ?, ?, ?)""",
-                (url, domain, title, content, links_json)
-            )
-            self.connection.commit()
-            logging.info(f"Saved content from {domain}")
-            return True
-        except Exception as e:
-            logging.error(f"Failed to save content: {e}", exc_info=True)
-            self.connection.rollback()
-            return False
+    def _migrate(self):
+        """Brings databases created by older versions up to SCHEMA_VERSION"""
+        version = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        
+        if version < 1:
+            # The original release had no compression, link tables, page metadata, request
+            # stats or search index, and kept each page's links as JSON in scraped_content
+            self._add_columns("scraped_content", {
+                "compression": "TEXT", "archive_record_id": "TEXT", "extractor": "TEXT",
+                "parser_version": "TEXT", "truncated": "INTEGER",
+            })
+            self._add_columns("scraping_log", {column: "INTEGER" for column in NETWORK_COLUMNS})
+            self._add_columns("scraping_log", {column: "REAL" for column in STAGE_COLUMNS})
+            if "links" in self._columns("scraped_content"):
+                self._backfill_links()
+                self.cursor.execute("ALTER TABLE scraped_content DROP COLUMN links")
+            self._index_pages()
+        
+        self.cursor.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        logging.info(f"Database schema migrated from version {version} to {SCHEMA_VERSION}")
+
+    def _add_columns(self, table, columns):
+        """Adds the columns a table created by an older version is missing"""
+        existing = self._columns(table)
+        for name, column_type in columns.items():
+            if name not in existing:
+                self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+    def _columns(self, table):
+        return {row[1] for row in self.cursor.execute(f"PRAGMA table_info({table})")}
+
+    def _backfill_links(self):
+        """Copies the JSON link lists of existing pages into the link tables"""
+        rows = self.cursor.execute(
+            """SELECT url, links FROM scraped_content 
+            WHERE id IN (SELECT MAX(id) FROM scraped_content GROUP BY url) AND links IS NOT NULL"""
+        ).fetchall()
+        for url, links_json in rows:
+            for sql, params in self._link_statements(url, json.loads(links_json)):
+                self.connection.executemany(sql, params)
+        if rows:
+            logging.info(f"Moved the links of {len(rows)} pages into page_links")
+
+    def save_content(self, url, domain, title, content, links, archive_record_id=None,
+                     extractor=None, parser_version=None, truncated=False):
+        """
+        Queues scraped content for the background writer. archive_record_id points at
+        the raw page, extractor and parser_version record what produced the content,
+        truncated whether the page was cut off by the page size or element limits.
+        """
+        # Content is compressed here, on the producer thread, so the writer only does I/O
+        stored, method = self._compress(content)
+        
+        # The page, its index entry and its links form one record, so a batch never holds only part of it.
+        # Only the latest copy of a URL is searchable, so the previous one leaves the index.
+        self._enqueue_statements([(UNINDEX_SQL.format(key="url"), [(url,)]), (
+            """INSERT INTO scraped_content 
+            (url, domain, title, content, compression, archive_record_id, extractor, parser_version, truncated) 
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [(url, domain, title, stored, method, archive_record_id, extractor, parser_version, int(bool(truncated)))]
+        ), (
+            # Statements run in queue order, so the newest row of the URL is the one just inserted
+            """INSERT INTO content_fts (rowid, title, content) 
+            SELECT MAX(id), ?, ? FROM scraped_content WHERE url = ?""",
+            [(title, content, url)]
+        ), (
+            "INSERT OR REPLACE INTO indexed_pages (url, page_id) SELECT url, MAX(id) FROM scraped_content WHERE url = ?",
+            [(url,)]
+        )] + self._link_statements(url, links))
+        logging.info(f"Queued content from {domain}")
+        return True
+
+    def update_content(self, row, title, content, links, movies, extractor, parser_version, records=None,
+                       truncated=False):
+        """
+        Queues the re-extracted content of a stored page (a row from stale_content) in place.
+        The links of the URL are replaced if the row is its latest copy, and so are the IMDb
+        movies and extracted records saved since that copy. A page stays flagged as truncated
+        once it was, since the archived copy is the cut-off page.
+        """
+        stored, method = self._compress(content)
+        statements = [(
+            UNINDEX_SQL.format(key="page_id"), [(row["id"],)]
+        ), (
+            """UPDATE scraped_content SET title = ?, content = ?, compression = ?, 
+            extractor = ?, parser_version = ?, truncated = MAX(COALESCE(truncated, 0), ?) WHERE id = ?""",
+            [(title, stored, method, extractor, parser_version, int(bool(truncated)), row["id"])]
+        ), (
+            # Re-indexed if it is still the latest copy when the writer gets to it
+            """INSERT INTO content_fts (rowid, title, content) 
+            SELECT MAX(id), ?, ? FROM scraped_content WHERE url = ? HAVING MAX(id) = ?""",
+            [(title, content, row["url"], row["id"])]
+        ), (
+            """INSERT OR REPLACE INTO indexed_pages (url, page_id) 
+            SELECT url, MAX(id) FROM scraped_content WHERE url = ? HAVING MAX(id) = ?""",
+            [(row["url"], row["id"])]
+        )]
+        if row["latest"]:
+            statements += self._link_statements(row["url"], links)
+            if movies:
+                statements += [
+                    ("DELETE FROM imdb_movies WHERE url = ? AND timestamp >= ?", [(row["url"], row["timestamp"])]),
+                    self._movie_statement(movies, row["url"]),
+                ]
+            if records:
+                statements += [
+                    ("DELETE FROM extracted_records WHERE url = ? AND timestamp >= ?", [(row["url"], row["timestamp"])]),
+                    self._record_statement(records, row["url"]),
+                ]
+        self._enqueue_statements(statements)
+
+    def _compress(self, content):
+        return compress(content, self.compression,
+                        DATABASE_CONFIG["compression_level"], DATABASE_CONFIG["compress_min_bytes"])
+
+    @staticmethod
+    def _link_statements(url, links):
+        """Statements that replace a page's outgoing links in the link tables"""
+        # json_each() expands the list inside SQLite instead of one Python round trip per link
+        links_json = json.dumps(links)
+        return [
+            ("INSERT OR IGNORE INTO urls (url) VALUES (?)", [(url,)]),
+            ("INSERT OR IGNORE INTO urls (url) SELECT value FROM json_each(?)", [(links_json,)]),
+            ("DELETE FROM page_links WHERE page_id = (SELECT id FROM urls WHERE url = ?)", [(url,)]),
+            ("""INSERT OR IGNORE INTO page_links (page_id, link_id) 
+            SELECT (SELECT id FROM urls WHERE url = ?), urls.id 
+            FROM json_each(?) JOIN urls ON urls.url = json_each.value""", [(url, links_json)]),
+        ]
 
     def save_imdb_movies(self, movies, url):
-        """Saves IMDb movies data to the database"""
-        try:
-            for rank, movie in enumerate(movies, 1):
-                self.cursor.execute(
-                    """INSERT INTO imdb_movies 
-                    (rank, title, year, genre, rating, duration, url)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (rank, movie['title'], movie['year'], 
-                     movie['genre'], movie['rating'], 
-                     movie['duration'], url)
+        """Queues IMDb movies data for the background writer"""
+        self._enqueue(*self._movie_statement(movies, url))
+        logging.info(f"Queued {len(movies)} IMDb movies")
+        return True
+
+    def save_records(self, url, records):
+        """Queues the typed records of an extraction rule, given as {name: [record, ...]}"""
+        self._enqueue(*self._record_statement(records, url))
+
+    @staticmethod
+    def _record_statement(records, url):
+        return (
+            "INSERT INTO extracted_records (url, name, data) VALUES (?, ?, ?)",
+            [(url, name, json.dumps(record, ensure_ascii=False))
+             for name, rows in records.items() for record in rows]
+        )
+
+    @staticmethod
+    def _movie_statement(movies, url):
+        return (
+            """INSERT INTO imdb_movies 
+            (rank, title, year, genre, rating, duration, url)
+            VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            [(rank, movie['title'], movie['year'], 
+              movie['genre'], movie['rating'], 
+              movie['duration'], url)
+             for rank, movie in enumerate(movies, 1)]
+        )
+
+    def log_request(self, url, status, bytes_transferred, stats=None):
+        """Queues a log entry; stats may fill any of LOG_STAT_COLUMNS"""
+        stats = stats or {}
+        metrics.inc("scraper_requests_total", status=status)
+        if stats.get("blocked_requests"):
+            metrics.inc("scraper_blocked_requests_total", stats["blocked_requests"])
+        self._enqueue(
+            f"""INSERT INTO scraping_log (url, status, bytes, {', '.join(LOG_STAT_COLUMNS)})
+            VALUES (?, ?, ?, {', '.join('?' * len(LOG_STAT_COLUMNS))})""",
+            [(url, status, bytes_transferred, *(stats.get(column) for column in LOG_STAT_COLUMNS))]
+        )
+
+    def index_archive_record(self, entry):
+        """Queues the index entry of a page written to the archive by ArchiveWriter"""
+        self._enqueue(
+            """INSERT OR IGNORE INTO archive_index 
+            (record_id, url, segment, offset, length, status, fetched_with) 
+            VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            [(entry["record_id"], entry["url"], entry["segment"], entry["offset"],
+              entry["length"], entry["status"], entry["fetched_with"])]
+        )
+
+    def get_archive_entry(self, url=None, record_id=None):
+        """Returns the index entry of a record, or of the latest archived fetch of a URL"""
+        if record_id:
+            condition, param = "record_id = ?", record_id
+        else:
+            condition, param = "url = ? ORDER BY rowid DESC LIMIT 1", url
+        with self._lock:
+            try:
+                row = self.connection.execute(
+                    f"""SELECT record_id, url, segment, offset, length, status, fetched_with, timestamp 
+                    FROM archive_index WHERE {condition}""",
+                    (param,)
+                ).fetchone()
+            except Exception as e:
+                logging.error(f"Failed to read archive index: {e}")
+                return None
+        if not row:
+            return None
+        return dict(zip(("record_id", "url", "segment", "offset", "length", "status", "fetched_with", "timestamp"), row))
+
+    def get_validators(self, url):
+        """Returns the cached ETag, Last-Modified and content hash for a URL"""
+        with self._lock:
+            try:
+                row = self.connection.execute(
+                    "SELECT etag, last_modified, content_hash FROM page_cache WHERE url = ?",
+                    (url,)
+                ).fetchone()
+            except Exception as e:
+                logging.error(f"Failed to read page cache: {e}")
+                return None
+        if not row:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "content_hash": row[2]}
+
+    def save_validators(self, url, etag, last_modified, content_hash):
+        """Remembers the validators of the latest fetch of a URL"""
+        self._enqueue(
+            """INSERT OR REPLACE INTO page_cache 
+            (url, etag, last_modified, content_hash, timestamp) 
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)""",
+            [(url, etag, last_modified, content_hash)]
+        )
+
+    def get_content(self, url):
+        """Returns the latest saved copy of a URL with its content decompressed"""
+        with self._lock:
+            try:
+                row = self.connection.execute(
+                    """SELECT domain, title, content, compression, timestamp FROM scraped_content 
+                    WHERE url = ? ORDER BY id DESC LIMIT 1""",
+                    (url,)
+                ).fetchone()
+            except Exception as e:
+                logging.error(f"Failed to read stored content: {e}")
+                return None
+        if not row:
+            return None
+        return {
+            "url": url,
+            "domain": row[0],
+            "title": row[1],
+            "content": decompress(row[2], row[3]),
+            "timestamp": row[4],
+        }
+
+    def get_links(self, url):
+        """Returns the links stored with the latest saved copy of a URL"""
+        return self._query_urls(
+            """SELECT link.url FROM page_links JOIN urls AS link ON link.id = page_links.link_id 
+            WHERE page_links.page_id = (SELECT id FROM urls WHERE url = ?)""",
+            url
+        )
+
+    def get_backlinks(self, url):
+        """Returns the saved pages that link to a URL"""
+        return self._query_urls(
+            """SELECT page.url FROM page_links JOIN urls AS page ON page.id = page_links.page_id 
+            WHERE page_links.link_id = (SELECT id FROM urls WHERE url = ?)""",
+            url
+        )
+
+    def read_chunk(self, table, columns, after_id=0, limit=500, where="", params=()):
+        """
+        Reads up to limit rows with id > after_id in id order, as dicts.
+        Paging by id keeps every read short, so a long export never holds the
+        connection or an open read transaction between chunks.
+        """
+        condition = f"id > ?{f' AND ({where})' if where else ''}"
+        sql = f"SELECT {', '.join(columns)} FROM {table} WHERE {condition} ORDER BY id LIMIT ?"
+        with self._lock:
+            cursor = self.connection.execute(sql, (after_id, *params, limit))
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def stale_content(self, current_versions, after_id=0, limit=500, domain=None):
+        """
+        Reads up to limit archived pages with id > after_id whose parser_version is not
+        the current version of their extractor; current_versions maps extractor names
+        to versions. Rows come with the archive location of their raw page and a latest
+        flag telling whether they are the newest copy of their URL.
+        """
+        condition = "AND host_matches(c.url, ?)" if domain else ""
+        params = (json.dumps(current_versions), after_id, *((domain,) if domain else ()), limit)
+        with self._lock:
+            try:
+                cursor = self.connection.execute(
+                    f"""SELECT c.id, c.url, c.timestamp, a.segment, a.offset, a.length, 
+                    c.id = (SELECT MAX(id) FROM scraped_content WHERE url = c.url) AS latest 
+                    FROM scraped_content AS c JOIN archive_index AS a ON a.record_id = c.archive_record_id 
+                    WHERE COALESCE(c.parser_version != json_extract(?, '$."' || c.extractor || '"'), 1) 
+                    AND c.id > ? {condition} ORDER BY c.id LIMIT ?""",
+                    params
                 )
-            self.connection.commit()
-            logging.info(f"Saved {len(movies)} IMDb movies")
-            return True
-        except Exception as e:
-            logging.error(f"Failed to save IMDb movies: {e}", exc_info=True)
-            self.connection.rollback()
-            return False
+                columns = [column[0] for column in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            except Exception as e:
+                logging.error(f"Failed to read stale content: {e}")
+                return None
 
-    def log_request(self, url, status, bytes_transferred):
-        try:
-            self.cursor.execute(
-                "INSERT INTO scraping_log (url, status, bytes) VALUES (?, ?, ?)",
-                (url, status, bytes_transferred)
-            )
-            self.connection.commit()
-        except Exception as e:
-            logging.error(f"Failed to log request: {e}")
+    def count_unarchived(self, domain=None):
+        """Number of stored pages without a raw copy in the archive"""
+        condition = "AND host_matches(url, ?)" if domain else ""
+        with self._lock:
+            return self.connection.execute(
+                f"SELECT COUNT(*) FROM scraped_content WHERE archive_record_id IS NULL {condition}",
+                (domain,) if domain else ()
+            ).fetchone()[0]
+
+    def column_types(self, table):
+        """Declared SQLite types of a table's columns"""
+        with self._lock:
+            return {row[1]: row[2].upper() for row in self.connection.execute(f"PRAGMA table_info({table})")}
+
+    def get_watermark(self, name):
+        """Last row id exported under the name, 0 if it never ran"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT last_id FROM export_watermarks WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def save_watermark(self, name, table, last_id):
+        self._enqueue(
+            """INSERT OR REPLACE INTO export_watermarks (name, table_name, last_id, timestamp) 
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)""",
+            [(name, table, last_id)]
+        )
+        self.flush()
+
+    def search(self, query, limit=10, domain=None):
+        """
+        Full-text search over the latest copy of every page, best matches first.
+        Uses FTS5 query syntax (AND/OR/NOT, "phrases", prefix*); a query that is not
+        valid syntax is searched as plain words. Title matches weigh more than body text.
+        Returns dicts with url, title, snippet, score (lower is better) and timestamp.
+        """
+        sql = f"""SELECT page.url, page.title, page.content, page.compression,
+                bm25(content_fts, 10.0, 1.0) AS score, page.timestamp
+            FROM content_fts 
+            JOIN indexed_pages AS indexed ON indexed.page_id = content_fts.rowid
+            JOIN scraped_content AS page ON page.id = indexed.page_id
+            WHERE content_fts MATCH ?
+                {'AND host_matches(page.url, ?)' if domain else ''}
+            ORDER BY score LIMIT ?"""
+        for match in (query, _plain_words(query)):
+            params = (match, domain, limit) if domain else (match, limit)
+            with self._lock:
+                try:
+                    rows = self.connection.execute(sql, params).fetchall()
+                    break
+                except sqlite3.OperationalError as e:
+                    logging.debug(f"Search query {match!r} failed: {e}")
+        else:
+            logging.error(f"Invalid search query: {query!r}")
+            return []
+        
+        snippets = _snippets(match, [(title, decompress(content, method)) for _, title, content, method, _, _ in rows])
+        return [{"url": url, "title": title, "snippet": snippet, "score": score, "timestamp": timestamp}
+                for (url, title, _, _, score, timestamp), snippet in zip(rows, snippets)]
+
+    def rebuild_search_index(self):
+        """Re-indexes the latest copy of every URL from scratch and merges the index into one segment"""
+        self.flush()
+        started = time.monotonic()
+        with self._lock:
+            try:
+                self._index_pages()
+                self.connection.execute("INSERT INTO content_fts (content_fts) VALUES ('optimize')")
+                self.connection.commit()
+            except Exception as e:
+                logging.error(f"Search index rebuild failed: {e}", exc_info=True)
+                self.connection.rollback()
+                return False
+        logging.info(f"Search index rebuilt in {time.monotonic() - started:.1f}s")
+        return True
+
+    def _index_pages(self):
+        """Replaces the search index with the decompressed text of the latest copy of every URL"""
+        self.connection.execute("INSERT INTO content_fts (content_fts) VALUES ('delete-all')")
+        self.connection.execute("DELETE FROM indexed_pages")
+        pages = self.connection.execute(
+            """SELECT id, url, title, content, compression FROM scraped_content 
+            WHERE id IN (SELECT MAX(id) FROM scraped_content GROUP BY url)"""
+        )
+        indexed = []
+        
+        def entries():
+            # Pages are decompressed one at a time as the insert consumes them
+            for page_id, url, title, content, method in pages:
+                indexed.append((url, page_id))
+                yield page_id, title, decompress(content, method)
+        
+        self.connection.executemany("INSERT INTO content_fts (rowid, title, content) VALUES (?, ?, ?)", entries())
+        self.connection.executemany("INSERT INTO indexed_pages (url, page_id) VALUES (?, ?)", indexed)
+
+    def _query_urls(self, sql, url):
+        with self._lock:
+            try:
+                return [row[0] for row in self.connection.execute(sql, (url,))]
+            except Exception as e:
+                logging.error(f"Failed to read the link graph: {e}")
+                return []
+
+    def flush(self):
+        """Blocks until every queued write has been committed"""
+        self._queue.join()
 
     def close(self):
-        if self.connection:
+        if not self._writer.is_alive():
+            return
+        # The sentinel makes the writer commit whatever is left and exit
+        self._queue.put(None)
+        self._writer.join()
+        with self._lock:
+            try:
+                # Move the WAL into the main database file so the shutdown is durable
+                self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except Exception as e:
+                logging.error(f"Final checkpoint failed: {e}")
             self.connection.close()
-            logging.info("Database connection closed")
+            self.connection = None
+        logging.info("Database connection closed")
+
+    def _enqueue(self, sql, rows):
+        self._enqueue_statements([(sql, rows)])
+
+    def _enqueue_statements(self, statements):
+        pending = getattr(self._local, "statements", None)
+        if pending is not None:
+            pending.extend(statements)
+            return
+        # Blocks when the writer falls behind, which slows producers down
+        self._queue.put((statements, None, None))
+
+    @contextmanager
+    def transaction(self, on_commit=None, on_failure=None):
+        """
+        Queues the writes made inside the block as one record, committed together or not at all.
+        Once the writer is done with it, on_commit or on_failure runs on the writer thread;
+        neither may queue writes of its own.
+        """
+        if getattr(self._local, "statements", None) is not None:
+            raise RuntimeError("Transactions cannot be nested")
+        self._local.statements = []
+        try:
+            yield
+            statements = self._local.statements
+        finally:
+            self._local.statements = None
+        self._queue.put((statements, on_commit, on_failure))
+
+    def _writer_loop(self):
+        """Commits queued writes in batches bounded by size and age"""
+        batch = []
+        deadline = None
+        running = True
+        while running:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+                if item is None:
+                    running = False
+                    self._queue.task_done()
+                else:
+                    batch.append(item)
+                    deadline = deadline or time.monotonic() + self.flush_interval
+            except queue.Empty:
+                pass
+            
+            if batch and (not running or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write_batch(batch)
+                for _ in batch:
+                    self._queue.task_done()
+                batch = []
+                deadline = None
+
+    def _write_batch(self, batch):
+        """
+        Writes one batch in a single transaction. Statements run in the order they were queued,
+        and a run of consecutive identical statements becomes a single executemany.
+        Each record's on_commit or on_failure callback runs once the batch is written.
+        """
+        failed = self._write_statements([statements for statements, _, _ in batch])
+        for i, (_, on_commit, on_failure) in enumerate(batch):
+            callback = on_failure if i in failed else on_commit
+            if callback is None:
+                continue
+            try:
+                callback()
+            except Exception as e:
+                logging.error(f"Post-commit callback failed: {e}", exc_info=True)
+
+    def _write_statements(self, batch):
+        """
+        Commits the statements of a batch, falling back to one record at a time if it fails.
+        Returns the positions of the records that could not be written.
+        """
+        if not any(batch):
+            return set()
+        # Only neighbours are merged, so statements that depend on each other (a page
+        # saved twice in one batch, say) keep their order
+        runs = []
+        for statements in batch:
+            for sql, rows in statements:
+                if runs and runs[-1][0] == sql:
+                    runs[-1][1].extend(rows)
+                else:
+                    runs.append((sql, list(rows)))
+        
+        with self._lock:
+            try:
+                # Writes are batched, so their time is measured per batch rather than per page
+                with metrics.stage("db_write"):
+                    for sql, rows in runs:
+                        self.connection.executemany(sql, rows)
+                    self.connection.commit()
+                metrics.inc("db_records_total", len(batch))
+                return set()
+            except Exception as e:
+                logging.error(f"Batch write of {len(batch)} records failed, retrying one by one: {e}")
+                self.connection.rollback()
+            
+            # Isolate the bad record instead of losing the whole batch
+            failed = set()
+            for i, statements in enumerate(batch):
+                try:
+                    for sql, rows in statements:
+                        self.connection.executemany(sql, rows)
+                    self.connection.commit()
+                except Exception as e:
+                    logging.error(f"Failed to write record: {e}", exc_info=True)
+                    self.connection.rollback()
+                    failed.add(i)
+            metrics.inc("db_records_total", len(batch) - len(failed))
+            return failed
@@ -0,0 +1,32 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+from urllib.parse import urlparse
+
+def get_host(url):
+    """Returns the lower-cased host of a URL without port"""
+    return (urlparse(url).hostname or "").lower()
+
+def domain_matches(host, suffix):
+    """True if host is the given domain or one of its subdomains"""
+    host = host.lower()
+    suffix = suffix.lower()
+    return host == suffix or host.endswith("." + suffix)
+
+def lookup_domain_setting(host, settings, default=None):
+    """
+    Looks up a per-domain setting keyed by domain suffix.
+    The most specific (longest) matching suffix wins.
+    """
+    best = None
+    for suffix in settings:
+        if domain_matches(host, suffix) and (best is None or len(suffix) > len(best)):
+            best = suffix
+    return settings[best] if best is not None else default
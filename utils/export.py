@@ -0,0 +1,148 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import csv
+import json
+import logging
+import os
+from config import EXPORT_CHUNK_SIZE
+from utils.compression import decompress
+from utils.database import LOG_STAT_COLUMNS
+
+# Exportable tables and their columns; compressed content is exported decompressed
+EXPORT_TABLES = {
+    "scraped_content": ["id", "url", "domain", "title", "content", "archive_record_id", "truncated", "timestamp"],
+    "imdb_movies": ["id", "rank", "title", "year", "genre", "rating", "duration", "url", "timestamp"],
+    "scraping_log": ["id", "url", "status", "bytes", *LOG_STAT_COLUMNS, "timestamp"],
+    "extracted_records": ["id", "url", "name", "data", "timestamp"],
+}
+
+FORMATS = ("jsonl", "csv", "parquet")
+EXTENSIONS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl", ".csv": "csv", ".parquet": "parquet"}
+
+class JsonlWriter:
+    def __init__(self, path, columns, column_types):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows):
+        self.file.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter:
+    def __init__(self, path, columns, column_types):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=columns)
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Writes each chunk as its own row group, so memory stays bounded by the chunk size"""
+
+    def __init__(self, path, columns, column_types):
+        try:
+            # Optional dependency, and a heavy import only exports to Parquet need
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet export needs the optional pyarrow package (pip install pyarrow)")
+        self.pyarrow = pyarrow
+        types = {"INTEGER": pyarrow.int64(), "REAL": pyarrow.float64()}
+        self.schema = pyarrow.schema(
+            [(column, types.get(column_types.get(column), pyarrow.string())) for column in columns])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, rows):
+        self.writer.write_table(self.pyarrow.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"jsonl": JsonlWriter, "csv": CsvWriter, "parquet": ParquetWriter}
+
+def guess_format(path):
+    """Format from the file extension, jsonl if it is not recognized"""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "jsonl")
+
+def _timestamp(value):
+    """Accepts dates and ISO timestamps; stored timestamps are UTC 'YYYY-MM-DD HH:MM:SS'"""
+    return value.replace("T", " ").rstrip("Z")
+
+def export_table(database, table, path, fmt=None, domain=None, since=None, until=None,
+                 watermark=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Streams a table to a JSONL, CSV or Parquet file in chunks of chunk_size rows.
+    domain keeps rows whose URL is on the domain or its subdomains; since and until
+    bound the timestamp. With a watermark name, only rows added after the last export
+    under that name are written, and the watermark advances once the file is complete.
+    Returns the number of rows exported, or None on failure.
+    """
+    if table not in EXPORT_TABLES:
+        logging.error(f"Unknown export table {table}, choose from {', '.join(EXPORT_TABLES)}")
+        return None
+    fmt = fmt or guess_format(path)
+    columns = EXPORT_TABLES[table]
+
+    conditions, params = [], []
+    if domain:
+        conditions.append("host_matches(url, ?)")
+        params.append(domain)
+    if since:
+        conditions.append("timestamp >= ?")
+        params.append(_timestamp(since))
+    if until:
+        conditions.append("timestamp < ?")
+        params.append(_timestamp(until))
+    # Content is decompressed in Python, outside the database lock
+    read_columns = columns + ["compression"] if table == "scraped_content" else columns
+
+    last_id = database.get_watermark(watermark) if watermark else 0
+    start_id = last_id
+    count = 0
+    # Written under a temporary name, so readers never pick up a half-written file
+    tmp_path = f"{path}.part"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        writer = WRITERS[fmt](tmp_path, columns, database.column_types(table))
+        try:
+            while True:
+                rows = database.read_chunk(table, read_columns, last_id, chunk_size,
+                                           " AND ".join(conditions), params)
+                if not rows:
+                    break
+                last_id = rows[-1]["id"]
+                if table == "scraped_content":
+                    for row in rows:
+                        row["content"] = decompress(row["content"], row.pop("compression"))
+                writer.write(rows)
+                count += len(rows)
+                logging.debug(f"Exported {count} rows of {table}")
+        finally:
+            writer.close()
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logging.error(f"Export of {table} to {path} failed: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+
+    if watermark and last_id > start_id:
+        database.save_watermark(watermark, table, last_id)
+    logging.info(f"Exported {count} rows of {table} to {path} ({fmt})")
+    return count
@@ -13,12 +13,12 @@ import sys
 from logging.handlers import RotatingFileHandler
 import os
 
-def setup_logger(level=logging.INFO):
+def setup_logger(level=logging.INFO, log_file="logs/scraper.log"):
     """
     Sets up the root logger.
     """
     # Create logs directory if not exists
-    os.makedirs("logs", exist_ok=True)
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
     
     logger = logging.getLogger()
     logger.setLevel(level)
@@ -35,7 +35,7 @@ def setup_logger(level=logging.INFO):
     
     # File handler: logs to a file, rotates when size limit is reached
     file_handler = RotatingFileHandler(
-        "logs/scraper.log", 
+        log_file, 
         maxBytes=10*1024*1024, # 10 MB
         backupCount=3,         # Keep 3 old log files
         encoding='utf-8'       # Ensure proper character encoding
@@ -0,0 +1,259 @@
+"""
+⚠️ DISCLAIMER:
+This web scraping tool is intended for educational purposes only. Users are responsible for:
+1. Complying with target website terms of service
+2. Respecting robots.txt directives
+3. Adhering to all applicable laws (copyright, data protection, CFAA, etc.)
+4. Avoiding scraping of private or sensitive information
+
+Misuse of this software may result in legal consequences. The developers assume no liability for improper use.
+"""
+import cProfile
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from config import METRICS_CONFIG
+
+# Pipeline stages timed per URL; each one has a <stage>_ms column in scraping_log
+STAGES = ("queue", "fetch", "acquire", "navigate", "ready", "backoff", "parse", "save")
+
+# Upper bounds in seconds of the duration histogram buckets
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class Histogram:
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        """(upper bound, observations at or below it) pairs, ending with +Inf"""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            pairs.append((bound, total))
+        pairs.append((float("inf"), self.count))
+        return pairs
+
+
+class Metrics:
+    """
+    Thread-safe counters and histograms keyed by name and labels, plus per-stage timing.
+    Stages listed in profile_stages also run under cProfile, one profiler per thread.
+    """
+
+    def __init__(self, profile_stages=()):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self.profile_stages = set(profile_stages)
+        self._profilers = {}  # (stage, thread id) -> cProfile.Profile
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def record_stage(self, stage, seconds, record=None):
+        """Observes a stage duration and adds it to the record's <stage>_ms entry"""
+        self.observe("scraper_stage_seconds", seconds, stage=stage)
+        if record is not None:
+            key = f"{stage}_ms"
+            record[key] = round(record.get(key, 0) + seconds * 1000, 3)
+
+    @contextmanager
+    def stage(self, stage, record=None):
+        """Times the block as one pass through a stage; stages must not nest"""
+        started = time.perf_counter()
+        try:
+            with self.profiled(stage):
+                yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - started, record)
+
+    @contextmanager
+    def profiled(self, stage):
+        """Runs the block under the thread's profiler for the stage if it is being profiled"""
+        if stage not in self.profile_stages:
+            yield
+            return
+        key = (stage, threading.get_ident())
+        with self._lock:
+            profiler = self._profilers.get(key)
+            if profiler is None:
+                profiler = self._profilers[key] = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+
+    def dump_profiles(self, directory):
+        """Writes one pstats file per profiled stage, merged over all threads"""
+        with self._lock:
+            by_stage = {}
+            for (stage, _), profiler in self._profilers.items():
+                by_stage.setdefault(stage, []).append(profiler)
+        if not by_stage:
+            return
+        os.makedirs(directory, exist_ok=True)
+        for stage, profilers in by_stage.items():
+            path = os.path.join(directory, f"{stage}-{os.getpid()}.prof")
+            try:
+                pstats.Stats(*profilers).dump_stats(path)
+                logging.info(f"Profile of the {stage} stage written to {path}")
+            except Exception as e:
+                logging.error(f"Could not write the {stage} profile: {e}")
+
+    def snapshot(self):
+        """All metrics as plain data, as written by dump_json"""
+        with self._lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self._counters.items())]
+            histograms = [{"name": name, "labels": dict(labels), "count": h.count, "sum": round(h.sum, 6),
+                           "buckets": {_format_bound(bound): count for bound, count in h.cumulative()}}
+                          for (name, labels), h in sorted(self._histograms.items())]
+        return {"timestamp": time.time(), "counters": counters, "histograms": histograms}
+
+    def dump_json(self, path):
+        """Replaces the file atomically, so readers never see a partial dump"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        typed = set()
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+            for (name, labels), h in sorted(self._histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                for bound, count in h.cumulative():
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', _format_bound(bound)),))} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {h.sum}")
+                lines.append(f"{name}_count{_format_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+# Process-wide registry
+metrics = Metrics(METRICS_CONFIG["profile_stages"])
+
+
+class MetricsExporter:
+    """
+    Publishes a registry while a crawl runs: Prometheus text on
+    http://<host>:<port>/metrics and/or a JSON file rewritten periodically.
+    Both are off unless configured.
+    """
+
+    def __init__(self, registry=metrics, config=METRICS_CONFIG):
+        self.registry = registry
+        self.config = config
+        self._server = None
+        self._dumper = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        port = self.config.get("http_port")
+        if port is not None:
+            # Only crawls that publish metrics pay for the HTTP server imports
+            from http.server import ThreadingHTTPServer
+            try:
+                self._server = ThreadingHTTPServer((self.config.get("http_host", "127.0.0.1"), port),
+                                                   self._handler_class())
+                threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+                logging.info(f"Serving metrics on http://{self._server.server_address[0]}:"
+                             f"{self._server.server_address[1]}/metrics")
+            except OSError as e:
+                logging.error(f"Could not start the metrics endpoint on port {port}: {e}")
+                self._server = None
+
+        if self.config.get("json_path"):
+            self._dumper = threading.Thread(target=self._dump_loop, name="metrics-json", daemon=True)
+            self._dumper.start()
+
+    def stop(self):
+        """Stops publishing and writes the final JSON dump and stage profiles"""
+        self._stopped.set()
+        if self._dumper:
+            self._dumper.join()
+            self._dump()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        if self.registry.profile_stages:
+            self.registry.dump_profiles(self.config["profile_dir"])
+
+    def _dump_loop(self):
+        while not self._stopped.wait(self.config["json_interval"]):
+            self._dump()
+
+    def _dump(self):
+        try:
+            self.registry.dump_json(self.config["json_path"])
+        except Exception as e:
+            logging.error(f"Metrics dump failed: {e}")
+
+    def _handler_class(self):
+        from http.server import BaseHTTPRequestHandler
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
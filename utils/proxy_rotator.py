@@ -10,49 +10,168 @@ Misuse of this software may result in legal consequences. The developers assume
 """
 import random
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-from config import PROXY_LIST
+from config import PROXY_LIST, PROXY_TEST_URL, PROXY_VALIDATION_TIMEOUT, PROXY_VALIDATION_WORKERS, PROXY_HEALTH_CONFIG
+
+class ProxyHealth:
+    """Rolling success rate and latency of one proxy"""
+
+    def __init__(self, success_rate=1.0, latency=None):
+        self.success_rate = success_rate
+        self.latency = latency
+        self.consecutive_failures = 0
+        self.cooldowns = 0
+        self.cooldown_until = 0.0
+
+    def score(self, latency_scale):
+        """Higher is better: success rate discounted by latency"""
+        latency = self.latency if self.latency is not None else latency_scale
+        return self.success_rate / (1 + latency / latency_scale)
+
 
 class ProxyRotator:
-    def __init__(self):
-        # Validate proxies upon initialization
-        self.proxies = self._validate_proxies(PROXY_LIST)
-        if not self.proxies:
-            logging.warning("No valid proxies available. Using direct connections")
-            
+    def __init__(self, proxies=PROXY_LIST, test_url=PROXY_TEST_URL, config=PROXY_HEALTH_CONFIG):
+        self.test_url = test_url
+        self.alpha = config["alpha"]
+        self.latency_scale = config["latency_scale"]
+        self.cooldown_after = config["cooldown_after"]
+        self.cooldown_seconds = config["cooldown_seconds"]
+        self.max_cooldowns = config["max_cooldowns"]
+        self._lock = threading.Lock()
+        self.health = {}
+
+        # Validate proxies in the background; each one can be used as soon as it passes
+        self._first_ready = threading.Event()
+        self._ready = threading.Event()
+        self._validator = threading.Thread(
+            target=self._validate, args=(list(proxies),), name="proxy-validation", daemon=True)
+        self._validator.start()
+
+    def _validate(self, proxies):
+        try:
+            if not self._validate_proxies(proxies):
+                logging.warning("No valid proxies available. Using direct connections")
+        finally:
+            self._first_ready.set()
+            self._ready.set()
+
+    def wait_ready(self, timeout=None):
+        """Blocks until proxy validation has finished"""
+        return self._ready.wait(timeout)
+
+    @property
+    def proxies(self):
+        self.wait_ready()
+        with self._lock:
+            return list(self.health)
+
     def _validate_proxies(self, proxies):
         """
-        Checks if the provided proxies are working by attempting to connect to a test URL.
-        Returns a list of valid proxies.
+        Checks all proxies concurrently against the test URL, adding each working one to
+        the pool, seeded with its measured latency, as soon as its check passes.
+        Returns the number of proxies in the pool.
         """
-        valid_proxies = []
-        for proxy in proxies:
-            try:
-                test_url = "https://www.google.com" # A reliable URL to test proxy connectivity
-                response = requests.get(
-                    test_url, 
-                    proxies={"http": proxy, "https": proxy}, # Specify proxy for both http and https
-                    timeout=5 # Short timeout for quick validation
-                )
-                if response.status_code == 200:
-                    valid_proxies.append(proxy)
-                    logging.info(f"Proxy validated: {proxy}")
-                else:
-                    logging.warning(f"Proxy {proxy} returned status code {response.status_code}")
-            except requests.exceptions.RequestException as e:
-                logging.warning(f"Proxy failed to connect: {proxy} - {e}")
-            except Exception as e:
-                logging.warning(f"An unexpected error occurred during proxy validation for {proxy}: {e}")
-                
-        # If no proxies are valid, return the original list so the scraper can still attempt direct connections
-        # This prevents the scraper from completely failing if proxies are misconfigured or unavailable.
-        return valid_proxies or proxies
+        if not proxies:
+            return 0
+
+        started = time.monotonic()
+        valid = 0
+        workers = min(len(proxies), PROXY_VALIDATION_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="proxy-check") as executor:
+            checks = {executor.submit(self._check_proxy, proxy): proxy for proxy in proxies}
+            for check in as_completed(checks):
+                latency = check.result()
+                if latency is None:
+                    continue
+                with self._lock:
+                    self.health[checks[check]] = ProxyHealth(latency=latency)
+                valid += 1
+                self._first_ready.set()
+        logging.info(f"Validated {valid}/{len(proxies)} proxies in {time.monotonic() - started:.1f}s")
+
+        with self._lock:
+            if not valid:
+                # If no proxies are valid, keep the original list so the scraper can still attempt them
+                # This prevents the scraper from completely failing if the test URL itself is unreachable.
+                self.health = {proxy: ProxyHealth() for proxy in proxies}
+            return len(self.health)
+
+    def _check_proxy(self, proxy):
+        """Returns the proxy's response time, or None if it does not work"""
+        try:
+            started = time.monotonic()
+            response = requests.get(
+                self.test_url,
+                proxies={"http": proxy, "https": proxy}, # Specify proxy for both http and https
+                timeout=PROXY_VALIDATION_TIMEOUT
+            )
+            if response.status_code == 200:
+                logging.info(f"Proxy validated: {proxy}")
+                return time.monotonic() - started
+            logging.warning(f"Proxy {proxy} returned status code {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"Proxy failed to connect: {proxy} - {e}")
+        except Exception as e:
+            logging.warning(f"An unexpected error occurred during proxy validation for {proxy}: {e}")
+        return None
 
     def get_proxy(self):
         """
-        Returns a random proxy from the list of validated proxies.
+        Picks a proxy at random, weighted by health score, skipping proxies in cooldown.
+        Chooses among the proxies validated so far; only waits while none has passed yet.
         Returns None if no proxies are available.
         """
-        if not self.proxies:
-            return None
-        return random.choice(self.proxies)
+        self._first_ready.wait()
+        with self._lock:
+            if not self.health:
+                return None
+            now = time.monotonic()
+            candidates = [(proxy, h) for proxy, h in self.health.items() if h.cooldown_until <= now]
+            if not candidates:
+                # Everything is cooling down; the one that recovers first is the best bet
+                return min(self.health.items(), key=lambda item: item[1].cooldown_until)[0]
+            weights = [h.score(self.latency_scale) for _, h in candidates]
+            if not any(weights):
+                return random.choice(candidates)[0]
+            return random.choices([proxy for proxy, _ in candidates], weights=weights)[0]
+
+    def report(self, proxy, success, latency=None):
+        """
+        Updates a proxy's health with the outcome of a real fetch.
+        Repeated failures put it in a cooldown that doubles each time; a proxy that
+        keeps failing after max_cooldowns cooldowns is evicted.
+        """
+        with self._lock:
+            health = self.health.get(proxy)
+            if health is None:
+                return
+            health.success_rate += self.alpha * ((1.0 if success else 0.0) - health.success_rate)
+            if latency is not None:
+                health.latency = latency if health.latency is None else \
+                    health.latency + self.alpha * (latency - health.latency)
+
+            if success:
+                health.consecutive_failures = 0
+                return
+
+            health.consecutive_failures += 1
+            if health.consecutive_failures < self.cooldown_after:
+                return
+            health.consecutive_failures = 0
+            if health.cooldowns >= self.max_cooldowns and len(self.health) > 1:
+                del self.health[proxy]
+                logging.warning(f"Evicted proxy {proxy} after {health.cooldowns} cooldowns")
+                return
+            cooldown = self.cooldown_seconds * (2 ** health.cooldowns)
+            health.cooldowns += 1
+            health.cooldown_until = time.monotonic() + cooldown
+            logging.warning(f"Cooling down proxy {proxy} for {cooldown:.0f}s")
+
+    def is_available(self, proxy):
+        """False once a proxy is cooling down or evicted"""
+        with self._lock:
+            health = self.health.get(proxy)
+            return health is not None and health.cooldown_until <= time.monotonic()